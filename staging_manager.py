@@ -1,4 +1,10 @@
-from copy import deepcopy
+def clone_assignments(state: dict) -> dict:
+    """
+    Copy a {key: {"action": str, "params": dict}} assignment map.
+    Params hold only primitives, so a two-level copy is equivalent to deepcopy.
+    """
+    return {k: {"action": v["action"], "params": dict(v["params"])} for k, v in state.items()}
+
 
 class StagingManager:
     """
@@ -19,7 +25,7 @@ class StagingManager:
         Load the authoritative state from the device/application.
         Clears any existing staged changes and history.
         """
-        self.base_state = deepcopy(state)
+        self.base_state = clone_assignments(state)
         self.staged_state = {}
         self._history = []
         self._redo_stack = []
@@ -30,7 +36,7 @@ class StagingManager:
         Pushes current state to history for undo.
         """
         # Save current state for undo
-        self._history.append(deepcopy(self.staged_state))
+        self._history.append(clone_assignments(self.staged_state))
         if len(self._history) > self.MAX_HISTORY:
             self._history.pop(0)
         # Clear redo stack (branching invalidates redo)
@@ -46,7 +52,7 @@ class StagingManager:
         if not self._history:
             return False
         # Push current state to redo stack
-        self._redo_stack.append(deepcopy(self.staged_state))
+        self._redo_stack.append(clone_assignments(self.staged_state))
         # Restore previous state
         self.staged_state = self._history.pop()
         return True
@@ -59,7 +65,7 @@ class StagingManager:
         if not self._redo_stack:
             return False
         # Push current state to history
-        self._history.append(deepcopy(self.staged_state))
+        self._history.append(clone_assignments(self.staged_state))
         # Restore redo state
         self.staged_state = self._redo_stack.pop()
         return True
@@ -84,13 +90,13 @@ class StagingManager:
         """
         Return the complete state map with staged changes applied.
         """
-        state = deepcopy(self.base_state)
+        state = clone_assignments(self.base_state)
         state.update(self.staged_state)
         return state
 
     def clear_stage(self):
         """Discard all staged changes. Clears history."""
-        self._history.append(deepcopy(self.staged_state))
+        self._history.append(clone_assignments(self.staged_state))
         self._redo_stack = []
         self.staged_state = {}
 
@@ -109,6 +115,11 @@ class StagingManager:
         """Return dictionary of only the staged items."""
         return self.staged_state
 
+    def get_dirty_changes(self) -> dict:
+        """Return staged items that actually differ from the base state."""
+        base = self.base_state
+        return {k: v for k, v in self.staged_state.items() if base.get(k) != v}
+
     def has_changes(self) -> bool:
         """Return True if there are pending changes."""
         return len(self.staged_state) > 0
@@ -63,5 +63,14 @@ class TestTransactionController(unittest.TestCase):
         self.assertTrue(success)
         self.mock_device.send_reliable.assert_not_called()
 
+    def test_execute_skips_unchanged_keys(self):
+        """Test that keys staged back to their device value send nothing."""
+        self.staging.stage_change("btn_1", "Left Click", {})
+        success = self.controller.execute_transaction(self.staging)
+        self.assertTrue(success)
+        self.mock_protocol.build_packets.assert_not_called()
+        self.mock_device.send_reliable.assert_not_called()
+        self.assertFalse(self.staging.has_changes())
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
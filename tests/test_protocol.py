@@ -8,8 +8,19 @@ for _parent in Path(__file__).resolve().parents:
 
 
 import unittest
+from unittest import mock
 import venus_protocol as vp
 
+
+def _fake_device(read_side_effect=None) -> vp.VenusDevice:
+    """A VenusDevice whose hidapi handle is a Mock; reads replay read_side_effect."""
+    dev = vp.VenusDevice("fake")
+    dev._dev = mock.Mock()
+    if read_side_effect is not None:
+        dev._dev.read.side_effect = read_side_effect
+    return dev
+
+
 class TestProtocol(unittest.TestCase):
     def test_packet_checksum(self):
         # Cmd 04 (Prepare)
@@ -25,6 +36,23 @@ class TestProtocol(unittest.TestCase):
         data = bytes(0x20) + events
         chk = vp.calculate_terminator_checksum(data, event_count=2)
         self.assertEqual(chk, 0x83)
+
+    def test_finalize_macro_checksum_matches_masked_form(self):
+        # The old call sites masked the sum and its inverse separately.
+        for total in (0, 0x83, 0xFF, 0x1234, 0xFFFF):
+            for count in (0, 2, 31):
+                for corr in (1, 4, 0x56):
+                    masked = ((~(total & 0xFF)) & 0xFF) - count + corr
+                    self.assertEqual(
+                        vp.finalize_macro_checksum(total, count, corr),
+                        masked & 0xFF,
+                    )
+        # The dump "FF as 00" strategy, as the tool computed it before the helper
+        data = bytes([0x04, 0xFF, 0x10, 0xFF, 0x20, 0x81, 0xFF])
+        old_sum = sum(b if b != 0xFF else 0 for b in data) & 0xFF
+        old_result = (((~old_sum) & 0xFF) - 2 + 1) & 0xFF
+        total = sum(data) - 0xFF * data.count(0xFF)
+        self.assertEqual(vp.finalize_macro_checksum(total, 2, 1), old_result)
         
     def test_macro_bind_packet(self):
         # Type 0x06, Slot 0, Once (0x01)
@@ -37,5 +65,310 @@ class TestProtocol(unittest.TestCase):
         # pkt[6]=0x06, pkt[7]=0x00, pkt[8]=0x01, pkt[9]=0x4E
         self.assertEqual(pkt[9], 0x4E)
 
+    def test_preset_reports_are_prebuilt(self):
+        for name, payload in vp.RGB_PRESETS.items():
+            self.assertEqual(vp.RGB_PRESET_REPORTS[name], vp.build_report(0x07, payload))
+        for rate, payload in vp.POLLING_RATE_PAYLOADS.items():
+            self.assertEqual(vp.POLL_RATE_REPORTS[rate], vp.build_report(0x07, payload))
+        with self.assertRaises(TypeError):
+            vp.POLL_RATE_REPORTS[1000] = b""
+
+    def test_binding_builders_are_cached(self):
+        first = vp.build_key_binding(0x01, 0x00, 0x04, vp.MODIFIER_SHIFT)
+        self.assertIsInstance(first, tuple)
+        self.assertIs(vp.build_key_binding(0x01, 0x00, 0x04, vp.MODIFIER_SHIFT), first)
+        self.assertEqual(len(first), 2)
+        self.assertIs(vp.build_disabled(0x60), vp.build_disabled(0x60))
+
+    def test_build_all_matches_build_report(self):
+        specs = [(0x04, bytes(14)), (0x07, bytes([0x00, 0x01, 0x0A, 0x02, 0xAB, 0xCD]))]
+        buf = vp.build_all(specs)
+        self.assertEqual(bytes(buf), b"".join(vp.build_report(c, p) for c, p in specs))
+
+    def test_flash_page_writes_match_single_writes(self):
+        page_data = bytes(range(256))
+        expected = b"".join(vp.build_flash_write(0x05, off, page_data[off:off + 10]) for off in range(0, 256, 10))
+        self.assertEqual(bytes(vp.build_flash_page_writes(0x05, page_data)), expected)
+
+    def test_macro_chunks_match_single_chunks(self):
+        data = bytes(range(1, 38))
+        addr = (0x03 << 8) | 0xF0
+        expected = []
+        for i in range(0, len(data), 10):
+            a = addr + i
+            expected.append(vp.build_macro_chunk(a & 0xFF, data[i:i + 10], a >> 8))
+        self.assertEqual(vp.build_macro_chunks(0x03, 0xF0, bytearray(data)), expected)
+
+    def test_send_reliable_waits_for_matching_ack(self):
+        dev = _fake_device(read_side_effect=[[0x09, 0x03], [0x09, 0x04]])
+        self.assertTrue(dev.send_reliable(vp.build_simple(0x04)))
+        self.assertEqual(dev._dev.read.call_count, 2)
+
+        dev._dev.read.side_effect = None
+        dev._dev.read.return_value = []
+        self.assertFalse(dev.send_reliable(vp.build_simple(0x04), timeout_ms=20))
+
+    def test_macro_event_write_into_matches_to_bytes(self):
+        buf = bytearray(b"\xAA")
+        events = [vp.MacroEvent(0x04, True, 300), vp.MacroEvent(0xE1, False, 3, True)]
+        for ev in events:
+            ev.write_into(buf)
+        self.assertEqual(bytes(buf), b"\xAA" + b"".join(ev.to_bytes() for ev in events))
+        self.assertEqual(events[0].to_bytes(), bytes([0x81, 0x04, 0x00, 0x01, 0x2C]))
+        self.assertEqual(vp.MacroEvent.encode_stream(events), bytes(buf[1:]))
+
+    def test_parse_macro_blob_round_trip(self):
+        events = [vp.MacroEvent(0x04, True, 300), vp.MacroEvent(0xE1, False, 3, True)]
+        raw = bytearray(384)
+        raw[0] = 2
+        name = "Ab".encode("utf-16le")
+        raw[1:1 + len(name)] = name
+        for i, ev in enumerate(events):
+            raw[0x20 + 5 * i:0x25 + 5 * i] = ev.to_bytes()
+        name_bytes, parsed = vp.parse_macro_blob(bytes(raw))
+        self.assertEqual(name_bytes, name)
+        self.assertEqual(parsed, events)
+
+    def test_send_many_validates_and_sends_in_order(self):
+        dev = _fake_device()
+        reports = [vp.SIMPLE_03, vp.SIMPLE_04]
+        dev.send_many(reports)
+        self.assertEqual([c.args[0] for c in dev._dev.send_feature_report.call_args_list], reports)
+        with self.assertRaises(ValueError):
+            dev.send_many([b"\x08\x04"])
+
+    def test_unlock_sends_reset_then_prebuilt_magic(self):
+        dev = _fake_device()
+        sent = []
+
+        def send(report):
+            # Each packet goes out only after the previous one was acked
+            self.assertEqual(dev._dev.read.call_count, len(sent))
+            sent.append(report)
+
+        dev._dev.send_feature_report.side_effect = send
+        dev._dev.read.side_effect = [[0x09, 0x09], [0x09, 0x4D], [0x09, 0x01]]
+        self.assertTrue(dev.unlock())
+        self.assertEqual(sent, [vp.SIMPLE_09, *vp._UNLOCK_MAGIC])
+        self.assertTrue(all(len(r) == vp.REPORT_LEN for r in sent))
+
+    def test_read_flash_pipelined_matches_out_of_order_responses(self):
+        dev = _fake_device()
+        dev._dev.read.side_effect = [
+            [],  # flush
+            [0x09, 0x08, 0x00, 0x03, 0x08, 0x02, 0xCC, 0xDD],
+            [0x09, 0x08, 0x00, 0x07, 0x00, 0x01, 0xEE],  # unrelated
+            [0x09, 0x08, 0x00, 0x03, 0x00, 0x02, 0xAA, 0xBB],
+        ]
+        self.assertEqual(dev.read_flash_pipelined([(0x03, 0x00, 2), (0x03, 0x08, 2)]),
+                         [b"\xAA\xBB", b"\xCC\xDD"])
+        sent = [c.args[0] for c in dev._dev.send_feature_report.call_args_list]
+        self.assertEqual(sent, [vp.build_flash_read(0x03, 0x00, 2), vp.build_flash_read(0x03, 0x08, 2)])
+
+    def test_send_batch_splits_buffer_into_reports(self):
+        dev = _fake_device()
+        buf = vp.build_flash_page_writes(0x01, bytes(30))
+        dev.send_batch(buf, interval_s=0)
+        sent = [bytes(c.args[0]) for c in dev._dev.send_feature_report.call_args_list]
+        self.assertEqual(sent, [bytes(buf[i:i + 17]) for i in range(0, len(buf), 17)])
+
+    def test_send_batch_idles_after_each_send(self):
+        # A send that takes longer than the interval must still be followed by the full gap
+        dev = _fake_device()
+        clock = [0.0]
+
+        def slow_send(report):
+            clock[0] += 0.003
+
+        dev._dev.send_feature_report.side_effect = slow_send
+        with mock.patch.object(vp.time, "monotonic", side_effect=lambda: clock[0]), \
+             mock.patch.object(vp.time, "sleep") as sleep:
+            dev.send_batch(vp.build_flash_page_writes(0x01, bytes(30)), interval_s=0.002)
+        self.assertEqual(dev._dev.send_feature_report.call_count, 3)
+        self.assertEqual(sleep.call_count, 2)
+        for call in sleep.call_args_list:
+            self.assertAlmostEqual(call.args[0], 0.002)
+
+    def test_read_flash_page_flushes_once(self):
+        # Fake device echoes each flash read request with data = offset bytes
+        pending = []
+        dev = _fake_device()
+        dev._dev.send_feature_report.side_effect = lambda req: pending.append(
+            [0x09, 0x08, 0x00, req[3], req[4], 8] + [req[4]] * 8)
+        dev._dev.read.side_effect = lambda n, timeout_ms: pending.pop(0) if pending else []
+
+        page = dev.read_flash_page(0x02)
+        self.assertEqual(page, bytes(off & 0xF8 for off in range(256)))
+        # Flushes are non-blocking reads; one drain for the whole page
+        flushes = [c for c in dev._dev.read.call_args_list if c.kwargs["timeout_ms"] == 0]
+        self.assertEqual(len(flushes), 1)
+
+    def test_read_flash_page_into_rejects_short_chunk(self):
+        # Device answers offset 0x10 with only 4 of 8 bytes
+        pending = []
+        dev = _fake_device()
+        dev._dev.send_feature_report.side_effect = lambda req: pending.append(
+            [0x09, 0x08, 0x00, req[3], req[4], 4 if req[4] == 0x10 else 8] + [0x55] * 8)
+        dev._dev.read.side_effect = lambda n, timeout_ms: pending.pop(0) if pending else []
+
+        buf = bytearray(b"\xAA" * 256)
+        with self.assertRaises(RuntimeError):
+            dev.read_flash_page_into(0x02, buf)
+
+    def test_read_flash_skips_stale_reports(self):
+        dev = _fake_device()
+        stale = [0x09, 0x08, 0x00, 0x01, 0x00, 8] + [0xAA] * 8
+        fresh = [0x09, 0x08, 0x00, 0x02, 0x10, 8] + list(range(8))
+        dev._dev.read.side_effect = [[], stale, fresh]
+        self.assertEqual(dev.read_flash(0x02, 0x10, 8), bytes(range(8)))
+        waits = [c.kwargs["timeout_ms"] for c in dev._dev.read.call_args_list[1:]]
+        self.assertTrue(all(0 < w <= 200 for w in waits))
+
+    def test_dpi_value_to_preset_is_nearest(self):
+        self.assertEqual(len(vp.DPI_VALUE_TO_PRESET), 256)
+        for value in range(256):
+            best = min(abs(info["value"] - value) for info in vp.DPI_PRESETS.values())
+            self.assertEqual(abs(vp.DPI_PRESETS[vp.DPI_VALUE_TO_PRESET[value]]["value"] - value), best)
+        self.assertEqual(vp.DPI_VALUE_TO_PRESET[0x2F], 4000)
+
+    @unittest.skipIf(sys.version_info < (3, 10), "dataclass slots need Python 3.10")
+    def test_profile_records_use_slots(self):
+        self.assertFalse(hasattr(vp.BUTTON_PROFILES["Button 1"], "__dict__"))
+        info = vp.DeviceInfo("p", "Venus", "m", 0x25A7, 0xFA08, "")
+        self.assertFalse(hasattr(info, "__dict__"))
+        self.assertEqual(info.interface_number, 0)
+        self.assertFalse(hasattr(vp.MacroEvent(0x04, True, 10), "__dict__"))
+
+    def test_dpi_value_conversions_interpolate_presets(self):
+        for dpi, info in vp.DPI_PRESETS.items():
+            self.assertEqual(vp.dpi_to_value(dpi), info["value"])
+            self.assertEqual(vp.value_to_dpi(info["value"]), dpi)
+        # Midpoint of the 1000-2000 segment, and extrapolation past the ends
+        self.assertEqual(vp.dpi_to_value(1500), round((0x0B + 0x17) / 2))
+        self.assertEqual(vp.dpi_to_value(100000), 255)
+        self.assertEqual(vp.value_to_dpi(0x11), 1500)
+        self.assertEqual(vp.value_to_dpi(0x11), vp.value_to_dpi(0x11 + 0.0))
+
+    def test_find_venus_usb_scans_bus_once(self):
+        wireless = mock.Mock(idVendor=0x25A7, idProduct=0xFA08)
+        wired = mock.Mock(idVendor=0x25A7, idProduct=0xFA07)
+        fake_usb = mock.Mock()
+        fake_usb.core.find.side_effect = lambda **kw: [d for d in (wireless, wired) if kw["custom_match"](d)]
+        with mock.patch.object(vp, "usb", fake_usb, create=True):
+            self.assertIs(vp._find_venus_usb(), wired)
+        fake_usb.core.find.assert_called_once()
+
+    def test_wait_for_hidraw_returns_once_interfaces_appear(self):
+        scans = [[], [{"interface_number": 0}], [{"interface_number": 0}, {"interface_number": 1}]]
+        with mock.patch.object(vp.hid, "enumerate", side_effect=scans) as enumerate_, \
+                mock.patch.object(vp.time, "sleep") as sleep:
+            self.assertTrue(vp._wait_for_hidraw(0x25A7, 0xFA07, [0, 1]))
+        self.assertEqual(enumerate_.call_count, 3)
+        self.assertEqual(sleep.call_count, 2)
+
+    def test_macro_slot_info_table_matches_stride(self):
+        self.assertEqual(vp.get_macro_slot_info(0), (0x03, 0x00))
+        self.assertEqual(vp.get_macro_slot_info(1), (0x04, 0x80))
+        for i in range(64):
+            addr = 0x300 + i * 0x180
+            self.assertEqual(vp.get_macro_slot_info(i), ((addr >> 8) & 0xFF, addr & 0xFF))
+
+    def test_static_bindings_are_primed_at_import(self):
+        hits = vp.build_disabled.cache_info().hits
+        for profile in vp.BUTTON_PROFILES.values():
+            vp.build_disabled(profile.apply_offset, page=0xC0)
+        self.assertEqual(vp.build_disabled.cache_info().hits - hits, len(vp.BUTTON_PROFILES))
+
+    def test_button_profiles_are_read_only_and_indexed(self):
+        for i, profile in enumerate(vp.BUTTON_PROFILES_INDEXED):
+            self.assertIs(profile, vp.BUTTON_PROFILES[f"Button {i + 1}"])
+        with self.assertRaises(TypeError):
+            vp.BUTTON_PROFILES["Button 1"] = None
+
+    def test_button_records_mirror_profiles(self):
+        self.assertEqual(len(vp.BUTTON_RECORDS), len(vp.BUTTON_PROFILES))
+        for key, offset, code_lo, is_page1 in vp.BUTTON_RECORDS:
+            profile = vp.BUTTON_PROFILES[key]
+            self.assertEqual((offset, code_lo, is_page1), (profile.apply_offset, profile.code_lo, profile.code_hi == 0x01))
+
+    def test_macro_chunk_accepts_memoryview(self):
+        data = bytearray(range(1, 24))
+        view = memoryview(data)
+        for i in range(0, len(data), 10):
+            pkt = vp.build_macro_chunk(i, view[i:i + 10], 0x03)
+            chunk = bytes(data[i:i + 10])
+            self.assertEqual(pkt[2:6], bytes([0x00, 0x03, i, len(chunk)]))
+            self.assertEqual(pkt[6:16], chunk.ljust(10, b"\x00"))
+
+    def test_read_flash_range_spans_pages(self):
+        pending = []
+        requests = []
+        dev = _fake_device()
+        def answer(req):
+            requests.append((req[3], req[4]))
+            pending.append([0x09, 0x08, 0x00, req[3], req[4], 8] + [req[3]] * 8)
+        dev._dev.send_feature_report.side_effect = answer
+        dev._dev.read.side_effect = lambda n, timeout_ms: pending.pop(0) if pending else []
+
+        data = dev.read_flash_range(0x04, 0x80, 384)
+        self.assertEqual(data, bytes([0x04] * 128 + [0x05] * 256))
+        self.assertEqual(len(requests), 48)
+        self.assertEqual(requests[16], (0x05, 0x00))
+
+    def test_ascii_modifier_lut_counts_shifted_chars(self):
+        text = "Hello, World!"
+        expected = sum(1 for c in text if c in vp.ASCII_TO_HID and vp.ASCII_TO_HID[c][1] != 0)
+        self.assertEqual(sum(text.encode("ascii").translate(vp.ASCII_MODIFIER_LUT)), expected)
+
+    def test_encode_text_macro_uses_ascii_table(self):
+        text = "Hi, é!"
+        expected = [vp.ASCII_TO_HID[c] for c in text if c in vp.ASCII_TO_HID]
+        self.assertEqual(vp.encode_text_macro(text), expected)
+        self.assertEqual(vp.ASCII_HID_LUT[ord("A")], vp.ASCII_TO_HID["A"])
+
+    def test_bus_scan_is_cached(self):
+        # One enumeration answers every product of the vendor until the TTL expires
+        fake_usb = mock.MagicMock()
+        fake_usb.core.find.return_value = [mock.Mock(idProduct=0xFA08)]
+        vp.invalidate_bus_scan()
+        with mock.patch.object(vp, "PYUSB_AVAILABLE", True), \
+             mock.patch.object(vp, "usb", fake_usb, create=True):
+            self.assertIn(0xFA08, vp.usb_products_on_bus(0x25A7))
+            self.assertNotIn(0xFA07, vp.usb_products_on_bus(0x25A7))
+            self.assertEqual(fake_usb.core.find.call_count, 1)
+            vp.usb_products_on_bus(0x25A7, max_age=0)
+            self.assertEqual(fake_usb.core.find.call_count, 2)
+        vp.invalidate_bus_scan()
+
+    def test_list_devices_is_cached(self):
+        info = {"vendor_id": 0x25A7, "product_id": 0xFA08, "path": b"/dev/hidraw7",
+                "interface_number": 1, "product_string": "Venus"}
+        vp.invalidate_bus_scan()
+        with mock.patch.object(vp.hid, "enumerate", side_effect=lambda vid, pid: [info] if vid == 0x25A7 else []) as enum, \
+             mock.patch.object(vp.hid, "device", side_effect=IOError):
+            first = vp.list_devices()
+            self.assertEqual([d.path for d in first], ["/dev/hidraw7"])
+            calls = enum.call_count
+            first.clear()
+            self.assertEqual(len(vp.list_devices()), 1)
+            self.assertEqual(enum.call_count, calls)
+            vp.list_devices(max_age=0)
+            self.assertGreater(enum.call_count, calls)
+        vp.invalidate_bus_scan()
+
+    def test_unlock_drops_cached_device_list(self):
+        # Re-attach invalidates hidraw paths even when the wait times out
+        vp._device_list_cache[False] = (float("inf"), ())
+        usb_dev = mock.Mock(idVendor=0x25A7, idProduct=0xFA08)
+        usb_dev.is_kernel_driver_active.return_value = True
+        with mock.patch.object(vp, "PYUSB_AVAILABLE", True), \
+             mock.patch.object(vp, "usb", mock.MagicMock(), create=True), \
+             mock.patch.object(vp, "_find_venus_usb", return_value=usb_dev), \
+             mock.patch.object(vp, "_wait_for_hidraw", return_value=False), \
+             mock.patch.object(vp.time, "sleep"), \
+             mock.patch("builtins.print"):
+            self.assertTrue(vp.try_unlock_device())
+        self.assertEqual(vp._device_list_cache, {})
+
 if __name__ == '__main__':
     unittest.main()
@@ -38,5 +38,11 @@ class TestRGB(unittest.TestCase):
         pkt = vp.build_rgb(0xE4, 0x00, 0x7F, vp.RGB_MODE_STEADY, 100)
         self.assertEqual(pkt[9], 0xF2)
 
+    def test_quick_pick_packets_are_prebuilt(self):
+        hits = vp.build_rgb.cache_info().hits
+        for r, g, b in vp.RGB_QUICK_PICKS:
+            vp.build_rgb(r, g, b, vp.RGB_MODE_NEON, 60)
+        self.assertEqual(vp.build_rgb.cache_info().hits - hits, len(vp.RGB_QUICK_PICKS))
+
 if __name__ == '__main__':
     unittest.main()
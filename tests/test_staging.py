@@ -5,7 +5,7 @@ import os
 # Add project root to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from staging_manager import StagingManager
+from staging_manager import StagingManager, clone_assignments
 
 class TestStagingManager(unittest.TestCase):
     def setUp(self):
@@ -47,6 +47,19 @@ class TestStagingManager(unittest.TestCase):
         self.assertFalse(self.manager.has_changes())
         self.assertEqual(self.manager.get_effective_state("btn_1")["action"], "Left Click")
 
+    def test_get_dirty_changes(self):
+        """Test that staging a key back to its base value is not dirty."""
+        self.manager.stage_change("btn_1", "Left Click", {})
+        self.manager.stage_change("btn_2", "Macro", {"index": 1})
+        self.assertEqual(list(self.manager.get_dirty_changes()), ["btn_2"])
+
+    def test_clone_assignments_is_independent(self):
+        """Test that cloned params can be mutated without touching the source."""
+        clone = clone_assignments(self.initial_state)
+        clone["btn_1"]["params"]["index"] = 3
+        self.assertEqual(clone["btn_2"], self.initial_state["btn_2"])
+        self.assertEqual(self.initial_state["btn_1"]["params"], {})
+
     def test_commit(self):
         """Test committing promotes staged changes to base state."""
         self.manager.stage_change("btn_1", "Macro", {})
@@ -1,5 +1,7 @@
 import sys
 import os
+import threading
+import time
 import unittest
 from unittest.mock import MagicMock, patch
 from PyQt6 import QtWidgets, QtCore, QtGui, QtTest
@@ -53,6 +55,8 @@ class TestUIStaged(unittest.TestCase):
         
         # Click Apply Binding (Should stage)
         QtTest.QTest.mouseClick(self.window.apply_button, QtCore.Qt.MouseButton.LeftButton)
+        # Redraws are coalesced through a single-shot timer
+        QtTest.QTest.qWait(50)
         
         # Verify visual cue (orange text or *)
         item = self.window.btn_table.item(0, 1)
@@ -61,6 +65,160 @@ class TestUIStaged(unittest.TestCase):
         expected_color = QtGui.QColor("orange")
         self.assertEqual(item.foreground().color(), expected_color)
 
+    def test_staged_redraws_are_coalesced(self):
+        """Verify that a burst of staging events triggers a single redraw."""
+        self.window.btn_table.selectRow(0)
+        with patch.object(self.window, '_do_update_staged_visuals') as mock_redraw:
+            # Timer holds a bound method captured at init; re-route it to the mock
+            self.window._redraw_timer.timeout.disconnect()
+            self.window._redraw_timer.timeout.connect(mock_redraw)
+            for action in ("Left Click", "Right Click", "Disabled", "Left Click"):
+                self.window.action_select.setCurrentText(action)
+            QtTest.QTest.qWait(50)
+            mock_redraw.assert_called_once()
+
+    def test_redraw_skips_unchanged_rows(self):
+        """Verify a redraw with no assignment changes does not re-render rows."""
+        self.window._do_update_staged_visuals()
+        with patch.object(self.window, '_get_binding_description', return_value="x") as mock_desc:
+            self.window._do_update_staged_visuals()
+            mock_desc.assert_not_called()
+            self.window.staging_manager.stage_change("Side 1", "Right Click", {})
+            self.window._do_update_staged_visuals()
+            mock_desc.assert_called_once()
+
+    def test_sorted_keys_follow_key_set(self):
+        """Verify sync key order is numeric and tracks added/removed keys."""
+        self.window.button_assignments = {"Button 10": {}, "Button 2": {}, "Button 1": {}}
+        self.assertEqual(self.window._get_sorted_keys(), ("Button 1", "Button 2", "Button 10"))
+        self.window.button_assignments["Button 3"] = {}
+        del self.window.button_assignments["Button 1"]
+        self.assertEqual(self.window._get_sorted_keys(), ("Button 2", "Button 3", "Button 10"))
+
+    def test_shared_device_is_refcounted(self):
+        """Verify nested device users share one handle, closed once idle after the last release."""
+        self.window.device_path = "/dev/hidraw-test"
+        first = self.window._acquire_device()
+        second = self.window._acquire_device()
+        self.assertIs(first, second)
+        first.open.assert_called_once()
+        self.window._release_device()
+        first.close.assert_not_called()
+        self.window._release_device()
+        # Kept open for the next operation until the idle timer fires
+        first.close.assert_not_called()
+        self.assertTrue(self.window._dev_idle_timer.isActive())
+        self.assertIs(self.window._acquire_device(), first)
+        self.assertFalse(self.window._dev_idle_timer.isActive())
+        self.window._release_device()
+        self.window._close_idle_device()
+        first.close.assert_called_once()
+        self.assertIsNone(self.window._dev)
+
+    def test_device_io_lock_covers_borrowed_section(self):
+        """Verify GUI borrows and the slot reader each hold the I/O lock while using the handle."""
+        self.window.device_path = "/dev/hidraw-test"
+        lock = self.window._dev_io_lock
+
+        def held_elsewhere():
+            # RLock is reentrant, so probe it from another thread
+            got = []
+
+            def probe():
+                got.append(lock.acquire(blocking=False))
+                if got[0]:
+                    lock.release()
+
+            thread = threading.Thread(target=probe)
+            thread.start()
+            thread.join()
+            return not got[0]
+
+        with patch.object(vp, "VenusDevice"):
+            self.window._acquire_device()
+            self.assertTrue(held_elsewhere())
+            self.window._release_device()
+            self.assertFalse(held_elsewhere())
+        self.window._close_idle_device()
+
+        held = []
+
+        def read(page, offset, length):
+            held.append(held_elsewhere())
+            return b""
+
+        with patch.object(self.window, "_require_device", return_value=True), \
+             patch.object(vp, "VenusDevice") as device_cls, \
+             patch.object(vp, "get_macro_slot_info", return_value=(0x03, 0x00), create=True), \
+             patch.object(vp, "parse_macro_blob", return_value=(b"", []), create=True):
+            device_cls.return_value.read_flash_range.side_effect = read
+            self.window.macro_index_spin.setValue(1)
+            self.window._load_macro_from_slot(1)
+            # The reader does not hold the lock on the GUI thread's behalf
+            self.window._macro_reader.wait(2000)
+            QtTest.QTest.qWait(50)
+        self.assertEqual(held, [True])
+        self.assertFalse(held_elsewhere())
+
+    def test_set_macro_events_fills_table_once(self):
+        events = [("A", True, 10, False), ("Shift", False, 20, True)]
+        with patch.object(self.window, "_update_macro_preview") as preview:
+            self.window._set_macro_events(events)
+        preview.assert_called_once()
+        table = self.window.macro_event_table
+        self.assertEqual(table.rowCount(), 2)
+        self.assertEqual([self.window._get_row_data(r) for r in range(2)],
+                         [("A", True, 10), ("Shift", False, 20)])
+        self.assertTrue(table.item(1, 1).data(QtCore.Qt.ItemDataRole.UserRole + 1))
+
+    def test_macro_slot_loads_on_worker_thread(self):
+        """Verify the slot is read off the GUI thread and the handle released after."""
+        self.window.device_path = "/dev/hidraw-test"
+        events = [MagicMock(keycode=0x04, is_down=True, delay_ms=5, is_modifier=False)]
+        with patch.object(self.window, "_require_device", return_value=True), \
+             patch.object(vp, "VenusDevice"), \
+             patch.object(vp, "get_macro_slot_info", return_value=(0x03, 0x00), create=True), \
+             patch.object(vp, "parse_macro_blob", return_value=("Hi".encode("utf-16le"), events), create=True):
+            self.window.macro_index_spin.setValue(1)
+            self.window._load_macro_from_slot(1)
+            reader = self.window._macro_reader
+            self.assertIsNotNone(reader)
+            reader.wait(2000)
+            QtTest.QTest.qWait(50)
+        self.assertIsNone(self.window._macro_reader)
+        self.assertEqual(self.window._dev_refs, 0)
+        self.assertEqual(self.window.macro_name_edit.text(), "Hi")
+        self.assertEqual(self.window.macro_event_table.rowCount(), 1)
+        self.assertEqual(self.window._get_row_data(0), ("Key 0x04", True, 5))
+
+    def test_macro_slot_load_follows_latest_selection(self):
+        """Verify a slot picked mid-read is loaded next and the stale result is dropped."""
+        self.window.device_path = "/dev/hidraw-test"
+        reads = []
+
+        def slow_read(page, offset, length):
+            reads.append(page)
+            time.sleep(0.1)
+            return bytes([page])
+
+        with patch.object(self.window, "_require_device", return_value=True), \
+             patch.object(vp, "VenusDevice") as device_cls, \
+             patch.object(vp, "get_macro_slot_info", side_effect=lambda i: (i + 1, 0), create=True), \
+             patch.object(vp, "parse_macro_blob",
+                          side_effect=lambda raw: (f"Slot {raw[0]}".encode("utf-16le"), []), create=True):
+            device_cls.return_value.read_flash_range.side_effect = slow_read
+            for slot in (1, 2, 3):
+                self.window.macro_index_spin.setValue(slot)
+                self.window._load_macro_from_slot()
+            for _ in range(100):
+                if self.window._macro_reader is None:
+                    break
+                QtTest.QTest.qWait(20)
+        self.assertIsNone(self.window._macro_reader)
+        self.assertEqual(reads, [1, 3])
+        self.assertEqual(self.window.macro_name_edit.text(), "Slot 3")
+        self.assertEqual(self.window._dev_refs, 0)
+
     def test_sync_not_called_on_stage(self):
         """Verify that _sync_all_buttons is NOT called when staging."""
         self.window.btn_table.selectRow(0)
@@ -64,7 +64,7 @@ def reset_mouse():
             reports = []
             
             # 1. Write Key Definition to Page 1/2
-            # build_key_binding returns a LIST of reports
+            # build_key_binding returns a cached TUPLE of reports; copy, never mutate
             kb_pkt = vp.build_key_binding(prof.code_hi, prof.code_lo, key)
             reports.extend(kb_pkt)
             
@@ -6,7 +6,7 @@ for _parent in Path(__file__).resolve().parents:
         sys.path.insert(0, str(_parent))
         break
 
-from venus_protocol import VenusDevice
+from venus_protocol import VenusDevice, finalize_macro_checksum
 
 # Dump data from 300 to 398 (Header + Name + Data)
 # Note: Dump starts at 0x300. 
@@ -62,7 +62,7 @@ ff ff ff ff ff ff ff ff ff ff 00 00 00 00 00 18
 # This covers 0x300 to 0x397 (0x98 bytes)
 # Terminator at 0x398: 03 5A 00 ...
 
-raw_bytes = bytes.fromhex(dump_hex.replace('\n', ''))
+raw_bytes = bytes.fromhex(dump_hex)  # fromhex skips the embedded newlines itself
 # Checksum is at index 0x99 of the page (offset 1 in terminator)
 # But my calculator expects "Data Buffer" excluding terminator.
 
@@ -76,19 +76,20 @@ def calculate_checksum(data, macro_index=0):
     # Strategy 3: Sum only valid packets? No, fw just sums blindly usually.
     
     # Try multiple strategies
-    s_sum_all = sum(data) & 0xFF
+    total = sum(data)
+    s_sum_all = total & 0xFF
     inv_sum_all = (~s_sum_all) & 0xFF
     
     count = data[0x1F] if len(data) >= 32 else 0
     correction = (macro_index + 1) ** 2
     
-    res1 = (inv_sum_all - count + correction) & 0xFF
+    res1 = finalize_macro_checksum(total, count, correction)
     
-    # Strategy 2: Treat FF as 00?
-    data_no_ff = bytes([b if b != 0xFF else 0x00 for b in data])
-    s_sum_noff = sum(data_no_ff) & 0xFF
+    # Strategy 2: Treat FF as 00? (drop the FF bytes from the full sum)
+    total_noff = total - 0xFF * data.count(0xFF)
+    s_sum_noff = total_noff & 0xFF
     inv_sum_noff = (~s_sum_noff) & 0xFF
-    res2 = (inv_sum_noff - count + correction) & 0xFF
+    res2 = finalize_macro_checksum(total_noff, count, correction)
     
     # Strategy 3: Only sum bytes that are part of valid packets?
     # No, too complex.
@@ -23,28 +23,30 @@ def verify_macro_slot(slot=0):
     mouse.open()
     
     try:
+        # Binding, macro header and first event, all read requests in flight at once
+        page, offset = vp.get_macro_slot_info(slot)
+        addr = (page << 8) | offset
+        spans = [(0x00, 0x60, 8)] + [((a >> 8) & 0xFF, a & 0xFF, 8) for a in range(addr, addr + 0x28, 8)]
+        bind_data, *slot_chunks = mouse.read_flash_pipelined(spans)
+        
         # 1. Check Binding for Button 1 (Offset 0x60)
         print("\n--- Button 1 Binding (Page 0, Offset 0x60) ---")
-        bind_data = mouse.read_flash(0x00, 0x60, 8)
         print(f"Raw Data: {bind_data.hex(' ')}")
         # Expected for Macro 1: 06 00 01 [chk] ...
         
-        # 2. Check Macro 1 Header (Page 03, Offset 0x00)
-        print("\n--- Macro 1 Header (Page 03, Offset 0x00) ---")
-        header_chunk1 = mouse.read_flash(0x03, 0x00, 8)
-        header_chunk2 = mouse.read_flash(0x03, 0x08, 8)
-        header_chunk3 = mouse.read_flash(0x03, 0x10, 8)
-        header_chunk4 = mouse.read_flash(0x03, 0x18, 8)
+        # 2. Check Macro Header
+        print(f"\n--- Macro {slot + 1} Header (Page {page:02X}, Offset 0x{offset:02X}) ---")
+        slot_head = b"".join(slot_chunks)
         
-        full_header = header_chunk1 + header_chunk2 + header_chunk3 + header_chunk4
+        full_header = slot_head[:0x20]
         print(f"Name Length: {full_header[0]}")
         name = full_header[1:31].decode('utf-16le', errors='ignore').strip('\x00')
         print(f"Macro Name : {name}")
         print(f"Event Count: {full_header[31]} (at 0x1F)")
         
         # 3. Check First Event
-        print("\n--- Macro 1 First Event (Page 03, Offset 0x20) ---")
-        event_chunk = mouse.read_flash(0x03, 0x20, 8)
+        print(f"\n--- Macro {slot + 1} First Event (Offset 0x20) ---")
+        event_chunk = slot_head[0x20:]
         print(f"Event 1: {event_chunk[:5].hex(' ')}")
         
     finally:
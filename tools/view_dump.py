@@ -14,6 +14,8 @@ for _parent in Path(__file__).resolve().parents:
 
 import sys
 import os
+import struct
+from itertools import groupby, islice
 
 # ANSI Color codes
 class C:
@@ -80,14 +82,62 @@ MODIFIER_NAMES = {
 MOUSE_BUTTONS = {0x01: "LClk", 0x02: "RClk", 0x04: "MClk", 0x08: "Back", 0x10: "Fwd"}
 
 EVENT_CODES = {0x80: "M↓", 0x81: "K↓", 0x40: "M↑", 0x41: "K↑"}
+EVENT_COLORS = {0x80: C.MODIFIER, 0x81: C.EVENT_DN, 0x40: C.MODIFIER, 0x41: C.EVENT_UP}
 
 POLLING_RATES = {0x01: "1000Hz", 0x02: "500Hz", 0x04: "250Hz", 0x08: "125Hz"}
 
-def col(byte: int, color: str) -> str:
-    """Colorize a single byte."""
-    return f"{color}{byte:02x}{C.RESET}"
+# Byte-indexed labels with the hex fallback for unknown values already filled in
+KEY_LABELS = tuple(HID_KEYS.get(v, f"K{v:02X}") for v in range(256))
+MODIFIER_LABELS = tuple(MODIFIER_NAMES.get(v, f"M{v:02X}") for v in range(256))
+TYPE_LABELS = tuple(BINDING_TYPES.get(v, f"T{v:02X}") for v in range(256))
+KBD_EVENT_LABELS = tuple(EVENT_CODES.get(v, f"{v:02X}") for v in range(256))
+MACRO_EVENT_LABELS = tuple(EVENT_CODES.get(v, f"E{v:02X}") for v in range(256))
+EVENT_COLOR_TABLE = tuple(EVENT_COLORS.get(v, C.UNKNOWN) for v in range(256))
 
-def get_page_type(page_num: int) -> tuple[str, int]:
+# (offset, button) for the 4-byte bindings on a config page (0x60-0xAF)
+CONFIG_BUTTONS = (
+    (0x60, "B1"), (0x64, "B2"), (0x68, "B3"), (0x6C, "B4"),
+    (0x70, "B5"), (0x74, "B6"), (0x78, "B16"), (0x7C, "B14"),
+    (0x80, "B7"), (0x84, "B8"), (0x88, "B15"), (0x8C, "B13"),
+    (0x90, "B9"), (0x94, "B10"), (0x98, "B11"), (0x9C, "B12"),
+    (0xA0, "BA"), (0xA4, "BB"), (0xA8, "BC"), (0xAC, "BD"),
+)
+
+# (offset, low-byte label, high-byte label prefix) for the 22 DPI stage pairs
+DPI_STAGE_LABELS = tuple(
+    (off, f"DPI{stage}L", f"DPI{stage}H=")
+    for stage, off in enumerate(range(0x04, 0x30, 2), start=1)
+)
+
+# (offset, button) for the 32-byte keyboard slots on a KbdData page
+KBD_SLOTS = (
+    (0x00, "B1"), (0x20, "B2"), (0x40, "B3"), (0x60, "B4"),
+    (0x80, "B5"), (0xA0, "B6"), (0xC0, "B7"), (0xE0, "B11"),
+)
+
+# DPI values are little-endian, macro delays big-endian
+U16LE = struct.Struct("<H").unpack_from
+U16BE = struct.Struct(">H").unpack_from
+
+# Every byte value pre-rendered as a hex cell ("xx ")
+HEX_CELLS = tuple(f"{byte:02x} " for byte in range(256))
+# Fixed page header lines
+PAGE_RULE = f"{C.BOLD}{'═' * 130}{C.RESET}\n"
+COLUMN_HEADER = (
+    f"{C.DIM}Off   0  1  2  3  4  5  6  7  8  9  A  B  C  D  E  F   Annotations{C.RESET}\n"
+    f"{'─' * 130}\n"
+)
+# Placeholder for an erased, unannotated row when unused rows are collapsed
+FF_ROW = b"\xff" * 16
+UNUSED_ROW = f"{C.UNUSED}{'·· ' * 16}{C.RESET} {C.DIM}(unused){C.RESET}\n"
+# Offset column for rows 0x000-0xFF0; dump pages are 0x100 bytes
+ROW_LABELS = tuple(f"{C.DIM}{row:04x}{C.RESET}  " for row in range(0, 0x1000, 16))
+
+def _value_color(val_name: str) -> str:
+    """Color for an event value byte; only key names starting with K are highlighted."""
+    return C.KEY if val_name.startswith("K") else C.UNKNOWN
+
+def _classify_page(page_num: int) -> tuple[str, int]:
     """Determine page type and profile number."""
     if page_num < 0x80:
         profile = 1
@@ -109,15 +159,24 @@ def get_page_type(page_num: int) -> tuple[str, int]:
     else:
         return "Unknown", profile
 
+PAGE_TYPES = tuple(_classify_page(p) for p in range(256))
+
+def get_page_type(page_num: int) -> tuple[str, int]:
+    """Determine page type and profile number."""
+    return PAGE_TYPES[page_num] if 0 <= page_num < 256 else _classify_page(page_num)
+
 class DumpViewer:
     def __init__(self, data: bytearray, page_num: int):
         self.data = data
         self.page = page_num
         self.page_type, self.profile = get_page_type(page_num)
-        self.annotations = {}  # offset -> annotation string
+        self.annotations = [""] * len(data)  # offset -> annotation string
+        self.colors = []  # offset -> ANSI color, filled by analyze()
         
     def analyze(self):
-        """Pre-analyze the page to generate all annotations."""
+        """Pre-analyze the page to generate all annotations and byte colors."""
+        self.colors = [C.ZERO if b == 0 else C.UNUSED if b == 0xFF else C.UNKNOWN
+                       for b in self.data]
         if self.page_type == "Config":
             self._analyze_config()
         elif self.page_type == "KbdData":
@@ -125,74 +184,77 @@ class DumpViewer:
         elif self.page_type == "Macro":
             self._analyze_macro()
     
+    def _annotate(self, off: int, ann: str, color: str):
+        """Record an annotation and the color its byte is drawn in.
+
+        Offsets past the end of a short dump are ignored. 0x00 and 0xFF
+        bytes keep their ZERO/UNUSED color whatever they mean.
+        """
+        if off >= len(self.data):
+            return
+        self.annotations[off] = ann
+        if self.data[off] not in (0x00, 0xFF):
+            self.colors[off] = color
+
     def _analyze_config(self):
         """Analyze configuration page (0x00, 0x80, 0xC0)."""
         d = self.data
         
         # Polling rate
-        self.annotations[0x00] = f"PollRate={POLLING_RATES.get(d[0], '?')}"
-        self.annotations[0x01] = "Unk01"
-        self.annotations[0x02] = f"DPIStages={d[2]}"
-        self.annotations[0x03] = "Unk03"
+        self._annotate(0x00, f"PollRate={POLLING_RATES.get(d[0], '?')}", C.POLL_RATE)
+        self._annotate(0x01, "Unk01", C.UNKNOWN)
+        self._annotate(0x02, f"DPIStages={d[2]}", C.DPI)
+        self._annotate(0x03, "Unk03", C.UNKNOWN)
         
         # DPI stages (0x04-0x2F, pairs)
-        for i, off in enumerate(range(0x04, 0x30, 2)):
-            stage = i + 1
+        for off, low_label, high_prefix in DPI_STAGE_LABELS:
             if off + 1 < len(d):
-                dpi_val = d[off] | (d[off+1] << 8)
-                self.annotations[off] = f"DPI{stage}L"
-                self.annotations[off+1] = f"DPI{stage}H={dpi_val}"
+                (dpi_val,) = U16LE(d, off)
+                self._annotate(off, low_label, C.DPI)
+                self._annotate(off+1, high_prefix + str(dpi_val), C.DPI)
         
         # RGB region (0x30-0x53)
         for off in range(0x30, 0x54):
-            self.annotations[off] = "RGB"
+            self._annotate(off, "RGB", C.RGB_R)
             
         # LED Config (0x54-0x5B)
-        self.annotations[0x54] = f"LEDMode={d[0x54]:02X}"
-        self.annotations[0x55] = f"Bright={int(d[0x55]/255*100)}%"
-        self.annotations[0x56] = "LEDSpd"
-        self.annotations[0x57] = "LEDDir"
-        self.annotations[0x58] = f"R={d[0x58]}"
-        self.annotations[0x59] = f"G={d[0x59]}"
-        self.annotations[0x5A] = f"B={d[0x5A]}"
+        self._annotate(0x54, f"LEDMode={d[0x54]:02X}", C.RGB_BRIGHT)
+        self._annotate(0x55, f"Bright={int(d[0x55]/255*100)}%", C.RGB_BRIGHT)
+        self._annotate(0x56, "LEDSpd", C.RGB_BRIGHT)
+        self._annotate(0x57, "LEDDir", C.RGB_BRIGHT)
+        self._annotate(0x58, f"R={d[0x58]}", C.RGB_R)
+        self._annotate(0x59, f"G={d[0x59]}", C.RGB_G)
+        self._annotate(0x5A, f"B={d[0x5A]}", C.RGB_B)
         for off in range(0x5B, 0x60):
-            self.annotations[off] = "LEDPad"
+            self._annotate(off, "LEDPad", C.RGB_BRIGHT)
         
         # Button bindings (0x60-0xAF)
-        btn_map = {
-            0x60: "B1", 0x64: "B2", 0x68: "B3", 0x6C: "B4",
-            0x70: "B5", 0x74: "B6", 0x78: "B16", 0x7C: "B14",
-            0x80: "B7", 0x84: "B8", 0x88: "B15", 0x8C: "B13",
-            0x90: "B9", 0x94: "B10", 0x98: "B11", 0x9C: "B12",
-            0xA0: "BA", 0xA4: "BB", 0xA8: "BC", 0xAC: "BD",
-        }
-        for base, name in btn_map.items():
+        for base, name in CONFIG_BUTTONS:
             if base + 3 < len(d):
                 btype = d[base]
-                type_name = BINDING_TYPES.get(btype, f"T{btype:02X}")
+                type_name = TYPE_LABELS[btype]
                 mod = d[base+1]
                 mod_name = MODIFIER_NAMES.get(mod, "") if mod else ""
                 
-                self.annotations[base] = f"{name}.Type={type_name}"
-                self.annotations[base+1] = f"{name}.D1" + (f"={mod_name}" if mod_name else f"={mod:02X}" if mod else "")
-                self.annotations[base+2] = f"{name}.D2={d[base+2]:02X}" if d[base+2] else f"{name}.D2"
-                self.annotations[base+3] = f"{name}.Chk"
+                # The DPI binding types share the DPI color
+                type_color = C.DPI if "DPI" in type_name else C.TYPE
+                self._annotate(base, f"{name}.Type={type_name}", type_color)
+                self._annotate(base+1, f"{name}.D1" + (f"={mod_name}" if mod_name else f"={mod:02X}" if mod else ""), C.UNKNOWN)
+                self._annotate(base+2, f"{name}.D2={d[base+2]:02X}" if d[base+2] else f"{name}.D2", C.UNKNOWN)
+                self._annotate(base+3, f"{name}.Chk", C.GUARD)
     
     def _analyze_kbd(self):
         """Analyze keyboard data pages (0x01-0x02, etc.)."""
         d = self.data
-        slots = {0x00: "B1", 0x20: "B2", 0x40: "B3", 0x60: "B4",
-                 0x80: "B5", 0xA0: "B6", 0xC0: "B7", 0xE0: "B11"}
-        
-        for base, name in slots.items():
+        for base, name in KBD_SLOTS:
             if base >= len(d):
                 continue
             count = d[base]
             if count == 0xFF:
-                self.annotations[base] = f"{name}.Empty"
+                self._annotate(base, f"{name}.Empty", C.UNUSED)
                 continue
                 
-            self.annotations[base] = f"{name}.Cnt={count}"
+            self._annotate(base, f"{name}.Cnt={count}", C.UNKNOWN)
             
             # Parse events (3 bytes each: Code, Val, Pad)
             pos = base + 1
@@ -206,20 +268,20 @@ class DumpViewer:
                     break
                     
                 evt_num += 1
-                code_name = EVENT_CODES.get(code, f"{code:02X}")
+                code_name = KBD_EVENT_LABELS[code]
                 if code in (0x81, 0x41):  # Key events
-                    val_name = HID_KEYS.get(val, f"K{val:02X}")
+                    val_name = KEY_LABELS[val]
                 else:  # Mod events
-                    val_name = MODIFIER_NAMES.get(val, f"M{val:02X}")
+                    val_name = MODIFIER_LABELS[val]
                 
-                self.annotations[pos] = f"{name}.E{evt_num}={code_name}"
-                self.annotations[pos+1] = f"={val_name}"
-                self.annotations[pos+2] = "Pad" if pad == 0 else f"M{pad:02X}"
+                self._annotate(pos, f"{name}.E{evt_num}={code_name}", EVENT_COLOR_TABLE[code])
+                self._annotate(pos+1, f"={val_name}", _value_color(val_name))
+                self._annotate(pos+2, "Pad" if pad == 0 else f"M{pad:02X}", C.UNKNOWN)
                 pos += 3
             
             # Guard byte
             if base + 7 < len(d):
-                self.annotations[base+7] = f"{name}.Guard"
+                self._annotate(base+7, f"{name}.Guard", C.GUARD)
     
     def _analyze_macro(self):
         """Analyze macro storage pages.
@@ -241,32 +303,32 @@ class DumpViewer:
             
             slot = d[macro_base]
             if slot == 0xFF:
-                self.annotations[macro_base] = "MacroEmpty"
+                self._annotate(macro_base, "MacroEmpty", C.UNUSED)
                 continue
             
-            self.annotations[macro_base] = f"Macro.Slot={slot}"
+            self._annotate(macro_base, f"Macro.Slot={slot}", C.MACRO_HDR)
             
             # Name (UTF-16LE, 2 bytes per char, up to 14 chars = 28 bytes)
+            raw = d[macro_base + 1:macro_base + 29]
+            name = raw[:len(raw) & ~1].decode("utf-16-le", "surrogatepass").split("\x00", 1)[0]
             name_chars = []
-            for i in range(1, 29, 2):
-                if macro_base + i + 1 < len(d):
-                    lo = d[macro_base + i]
-                    hi = d[macro_base + i + 1]
-                    if lo == 0 and hi == 0:
-                        break
-                    char = chr(lo | (hi << 8))
-                    if char.isprintable():
-                        name_chars.append(char)
-                    self.annotations[macro_base + i] = f"Name.{len(name_chars)}"
-                    self.annotations[macro_base + i + 1] = ""
+            off = macro_base + 1
+            for char in name:
+                if char.isprintable():
+                    name_chars.append(char)
+                # Characters outside the BMP take a surrogate pair (4 bytes)
+                for unit in range(off, off + (4 if ord(char) > 0xFFFF else 2), 2):
+                    self._annotate(unit, f"Name.{len(name_chars)}", C.MACRO_NAME)
+                    self._annotate(unit + 1, "", C.UNKNOWN)
+                    off += 2
             
             if name_chars:
-                self.annotations[macro_base + 1] = f"Name=\"{''.join(name_chars)}\""
+                self._annotate(macro_base + 1, f"Name=\"{''.join(name_chars)}\"", C.MACRO_NAME)
             
             # Event count at offset 0x1F from base
             if macro_base + 0x1F < len(d):
                 evt_count = d[macro_base + 0x1F]
-                self.annotations[macro_base + 0x1F] = f"EvtCnt={evt_count}"
+                self._annotate(macro_base + 0x1F, f"EvtCnt={evt_count}", C.MACRO_LEN)
             
             # Macro events start at base + 0x20
             # Format: [EventCode] [Key] [00] [DelayHi] [DelayLo] = 5 bytes per event
@@ -279,116 +341,71 @@ class DumpViewer:
                 
                 key = d[evt_base + 1]
                 pad = d[evt_base + 2]
-                delay_hi = d[evt_base + 3]
-                delay_lo = d[evt_base + 4]
-                delay = (delay_hi << 8) | delay_lo
+                (delay,) = U16BE(d, evt_base + 3)
+                delay_hi = delay >> 8
                 
                 evt_num += 1
-                code_name = EVENT_CODES.get(code, f"E{code:02X}")
+                code_name = MACRO_EVENT_LABELS[code]
                 if code in (0x81, 0x41):
-                    val_name = HID_KEYS.get(key, f"K{key:02X}")
+                    val_name = KEY_LABELS[key]
                 else:
-                    val_name = MODIFIER_NAMES.get(key, f"M{key:02X}")
+                    val_name = MODIFIER_LABELS[key]
                 
-                self.annotations[evt_base] = f"M{evt_num}.{code_name}"
-                self.annotations[evt_base + 1] = f"={val_name}"
-                self.annotations[evt_base + 2] = ""
-                self.annotations[evt_base + 3] = f"D={delay}ms" if delay_hi else ""
-                self.annotations[evt_base + 4] = "" if delay_hi else f"D={delay}ms"
+                self._annotate(evt_base, f"M{evt_num}.{code_name}", EVENT_COLOR_TABLE[code])
+                self._annotate(evt_base + 1, f"={val_name}", _value_color(val_name))
+                self._annotate(evt_base + 2, "", C.UNKNOWN)
+                self._annotate(evt_base + 3, f"D={delay}ms" if delay_hi else "", C.DELAY if delay_hi else C.UNKNOWN)
+                self._annotate(evt_base + 4, "" if delay_hi else f"D={delay}ms", C.UNKNOWN if delay_hi else C.DELAY)
                 
                 evt_base += 5
     
-    def get_byte_color(self, offset: int) -> str:
-        """Get the appropriate color for a byte based on its meaning."""
-        byte = self.data[offset] if offset < len(self.data) else 0
-        ann = self.annotations.get(offset, "")
-        
-        # Special values
-        if byte == 0xFF:
-            return C.UNUSED
-        if byte == 0x00:
-            return C.ZERO
-        
-        # Based on annotation content
-        if "PollRate" in ann:
-            return C.POLL_RATE
-        if "DPI" in ann:
-            return C.DPI
-        if ann.startswith("R=") or "RGB" in ann:
-            return C.RGB_R
-        if ann.startswith("G="):
-            return C.RGB_G
-        if ann.startswith("B="):
-            return C.RGB_B
-        if "Bright" in ann or "LED" in ann:
-            return C.RGB_BRIGHT
-        if ".Type=" in ann:
-            return C.TYPE
-        if ".D1" in ann and "Mod" in ann:
-            return C.MODIFIER
-        if ".D1" in ann or ".D2" in ann:
-            return C.UNKNOWN
-        if ".Chk" in ann or "Guard" in ann:
-            return C.GUARD
-        if "K↓" in ann or "K↑" in ann:
-            return C.EVENT_DN if "↓" in ann else C.EVENT_UP
-        if "M↓" in ann or "M↑" in ann:
-            return C.MODIFIER
-        if "=K" in ann or ann in HID_KEYS.values():
-            return C.KEY
-        if "D=" in ann and "ms" in ann:
-            return C.DELAY
-        if "Macro" in ann or "Slot=" in ann:
-            return C.MACRO_HDR
-        if "Name" in ann:
-            return C.MACRO_NAME
-        if "EvtCnt" in ann:
-            return C.MACRO_LEN
-        if "M." in ann and ".E" in ann:
-            return C.EVENT_DN
-        
-        return C.UNKNOWN
+    def display(self, collapse_unused: bool = False):
+        """Display the page with full annotations.
 
-    def display(self):
-        """Display the page with full annotations."""
+        With collapse_unused, rows of sixteen 0xFF bytes that carry no
+        annotation are drawn as a single dim placeholder.
+        """
         self.analyze()
         
-        print(f"\n{C.BOLD}{'═' * 130}{C.RESET}")
-        print(f"{C.BOLD}PAGE 0x{self.page:02X} - {self.page_type} (Profile {self.profile}){C.RESET}")
-        print(f"{C.BOLD}{'═' * 130}{C.RESET}")
-        print(f"{C.DIM}Off   0  1  2  3  4  5  6  7  8  9  A  B  C  D  E  F   Annotations{C.RESET}")
-        print(f"{'─' * 130}")
+        # Collect the whole page and write it once instead of print() per row
+        out = [
+            "\n", PAGE_RULE,
+            f"{C.BOLD}PAGE 0x{self.page:02X} - {self.page_type} (Profile {self.profile}){C.RESET}\n",
+            PAGE_RULE, COLUMN_HEADER,
+        ]
         
         for row in range(0, len(self.data), 16):
             # Offset
-            line = f"{C.DIM}{row:04x}{C.RESET}  "
+            line = ROW_LABELS[row >> 4] if row < 0x1000 else f"{C.DIM}{row:04x}{C.RESET}  "
             
-            # Hex bytes with colors
-            for i in range(16):
-                off = row + i
-                if off < len(self.data):
-                    byte = self.data[off]
-                    color = self.get_byte_color(off)
-                    line += f"{col(byte, color)} "
-                else:
-                    line += "   "
+            # Distinct non-empty annotations in offset order
+            anns = dict.fromkeys(filter(None, self.annotations[row:row + 16]))
             
-            # Annotations for this row
-            line += " "
-            anns = []
-            for i in range(16):
-                off = row + i
-                ann = self.annotations.get(off, "")
-                if ann and ann not in anns and len(ann) > 0:
-                    anns.append(ann)
+            if collapse_unused and not anns and self.data[row:row + 16] == FF_ROW:
+                out.append(line + UNUSED_ROW)
+                continue
+            
+            # Hex bytes with colors; the escape is only emitted when the
+            # color changes, and one reset closes the row
+            end = min(row + 16, len(self.data))
+            cells = []
+            for color, offs in groupby(range(row, end), self.colors.__getitem__):
+                cells.append(color)
+                cells.extend([HEX_CELLS[self.data[off]] for off in offs])
+            if cells:
+                cells.append(C.RESET)
+            line += "".join(cells) + "   " * (16 - (end - row))
             
             # Compact annotations
-            ann_str = " │ ".join(anns[:5])
+            line += " "
+            ann_str = " │ ".join(islice(anns, 5))
             if len(ann_str) > 70:
                 ann_str = ann_str[:67] + "..."
             
-            line += f"{C.DIM}{ann_str}{C.RESET}"
-            print(line)
+            out.append(f"{line}{C.DIM}{ann_str}{C.RESET}\n")
+        
+        sys.stdout.write("".join(out))
+        sys.stdout.flush()
 
 def print_legend():
     print(f"\n{C.BOLD}Color Legend:{C.RESET}")
@@ -419,8 +436,9 @@ def main():
         return
     
     # Directory mode
+    show_all = len(sys.argv) > 2 and sys.argv[2].lower() == "all"
     if len(sys.argv) > 2:
-        if sys.argv[2].lower() == "all":
+        if show_all:
             pages = list(range(256))
         else:
             pages = []
@@ -433,21 +451,24 @@ def main():
     else:
         pages = [0x00, 0x01, 0x02, 0x03]  # Default pages
     
+    # One directory listing instead of an exists() check per page
+    page_files = {entry.name: entry.path for entry in os.scandir(path) if entry.is_file()}
+    
     for page_num in pages:
-        bin_path = os.path.join(path, f"page_{page_num:02X}.bin")
-        if not os.path.exists(bin_path):
+        bin_path = page_files.get(f"page_{page_num:02X}.bin")
+        if bin_path is None:
             continue
         
         with open(bin_path, "rb") as f:
             data = bytearray(f.read())
         
         # Skip completely empty pages in "all" mode
-        if len(sys.argv) > 2 and sys.argv[2].lower() == "all":
-            if all(b == 0xFF for b in data):
+        if show_all:
+            if data.count(0xFF) == len(data):
                 continue
         
         viewer = DumpViewer(data, page_num)
-        viewer.display()
+        viewer.display(collapse_unused=show_all)
     
     print_legend()
 
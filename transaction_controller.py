@@ -28,7 +28,13 @@ class TransactionController:
             self._log("TransactionController: No changes to apply.")
             return True
 
-        changes = staging_manager.get_staged_changes()
+        # Only write keys whose staged value differs from the device state
+        changes = staging_manager.get_dirty_changes()
+        if not changes:
+            self._log("TransactionController: Staged changes match device state. Nothing to send.")
+            staging_manager.commit()
+            return True
+
         all_packets = []
         
         self._log(f"TransactionController: Preparing to apply {len(changes)} changes...")
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import os
 import sys
 import json
+import mmap
+import struct
+import threading
 import time
 from pathlib import Path
-from copy import deepcopy
 
 from PyQt6 import QtCore, QtGui, QtWidgets
 
@@ -18,7 +21,7 @@ except ImportError:
 import venus_protocol as vp
 import holtek_protocol as hp
 import device_driver as dd
-from staging_manager import StagingManager
+from staging_manager import StagingManager, clone_assignments
 from transaction_controller import TransactionController
 
 
@@ -30,6 +33,112 @@ DEFAULT_MACRO_EVENTS_HEX = (
 )
 DEFAULT_MACRO_TAIL_HEX = "000369000000"
 
+# Set VENUS_DEBUG=1 to log per-button flash parsing details when reading settings
+DEBUG_LOG = bool(os.environ.get("VENUS_DEBUG"))
+# Set VENUS_DEBUG_PACKETS=1 to log the hex of every packet sent during sync
+DEBUG_PACKET_LOG = bool(os.environ.get("VENUS_DEBUG_PACKETS"))
+
+# Mouse button action -> D1 value for build_mouse_param
+MOUSE_VAL_MAP = {"Left Click": 0x01, "Right Click": 0x02, "Middle Click": 0x04, "Back": 0x08, "Forward": 0x10}
+
+# DPI Control func id -> display name
+DPI_FUNC_NAMES = {1: "Loop", 2: "Up", 3: "Down"}
+
+# HID key name -> shorter Qt-style display name
+QT_DISPLAY_KEY_NAMES = {
+    "Enter": "Return", "Escape": "Esc", "Delete": "Del", "Insert": "Ins",
+    "PageUp": "PgUp", "PageDown": "PgDown", "Space": "Space"
+}
+
+# Modifier bit -> display name, in display order
+MODIFIER_DISPLAY_NAMES = (
+    (vp.MODIFIER_CTRL, "Ctrl"),
+    (vp.MODIFIER_SHIFT, "Shift"),
+    (vp.MODIFIER_ALT, "Alt"),
+    (vp.MODIFIER_WIN, "Win"),
+)
+
+# DPI Control func id (1=Loop, 2=+, 3=-) -> dummy key stored in the key definition
+DPI_DUMMY_KEY = {1: 0x23, 2: 0x24, 3: 0x25}
+
+# Flash page 0 byte 0x04 -> polling rate (Hz); unknown codes read as 1000
+POLL_CODE_TO_RATE = {0x00: 1000, 0x01: 500, 0x02: 250, 0x04: 125}
+
+# Flash page 0 byte 0x58 -> RGB mode shown in the mode combo (0x57 also covers neon)
+RGB_FLASH_MODE_MAP = {0x56: vp.RGB_MODE_STEADY, 0x57: vp.RGB_MODE_BREATHING, 0x00: vp.RGB_MODE_OFF}
+
+
+# Per-action packet builders for one profile page.
+# Signature: (params, code_hi, code_lo, apply_offset, page) -> list of reports,
+# where code_hi already includes the page offset.
+def _build_keyboard(params: dict, code_hi: int, code_lo: int, apply_offset: int, page: int) -> list[bytes]:
+    hid_key = params.get("key", 0)
+    modifier = params.get("mod", 0)
+    # Page 1 Write (Key Def) + Page 0 Bind (Type 05)
+    return [*vp.build_key_binding(code_hi, code_lo, hid_key, modifier),
+            vp.build_keyboard_bind(apply_offset, page=page)]
+
+
+def _build_disabled(params: dict, code_hi: int, code_lo: int, apply_offset: int, page: int) -> list[bytes]:
+    return [vp.build_disabled(apply_offset, page=page)]
+
+
+def _make_mouse_builder(action: str):
+    val = MOUSE_VAL_MAP[action]
+
+    def _build_mouse(params: dict, code_hi: int, code_lo: int, apply_offset: int, page: int) -> list[bytes]:
+        return [vp.build_mouse_param(apply_offset, val, page=page)]
+    return _build_mouse
+
+
+def _build_dpi_control(params: dict, code_hi: int, code_lo: int, apply_offset: int, page: int) -> list[bytes]:
+    func_id = params.get("func", 1)
+    dummy_key = DPI_DUMMY_KEY.get(func_id, 0x25)
+    return [*vp.build_key_binding(code_hi, code_lo, dummy_key, 0),
+            vp.build_apply_binding(apply_offset, action_type=2, action_code=0x50, modifier=func_id, page=page)]
+
+
+def _build_special(params: dict, code_hi: int, code_lo: int, apply_offset: int, page: int) -> list[bytes]:
+    delay = params.get("delay", 40)
+    rep = params.get("repeat", 3)
+    return [vp.build_special_binding(apply_offset, delay, rep, page=page)]
+
+
+def _build_media(params: dict, code_hi: int, code_lo: int, apply_offset: int, page: int) -> list[bytes]:
+    return [vp.build_apply_binding(apply_offset, action_type=5, action_code=0x51, page=page)]
+
+
+def _build_macro(params: dict, code_hi: int, code_lo: int, apply_offset: int, page: int) -> list[bytes]:
+    idx = params.get("index", 1)
+    mode = params.get("mode", vp.MACRO_REPEAT_ONCE)
+    return [vp.build_macro_bind(apply_offset, idx - 1, mode, page=page)]
+
+
+ACTION_BUILDERS = {
+    "Keyboard Key": _build_keyboard,
+    "Disabled": _build_disabled,
+    **{action: _make_mouse_builder(action) for action in MOUSE_VAL_MAP},
+    "DPI Control": _build_dpi_control,
+    "Fire Key": _build_special,
+    "Triple Click": _build_special,
+    "Media Key": _build_media,
+    "Macro": _build_macro,
+}
+
+
+def build_binding_reports(action: str, params: dict, code_hi_base: int, code_lo: int, apply_offset: int) -> list[bytes]:
+    """Build the Venus Pro reports for one binding across all profile pages.
+
+    Actions without a builder (e.g. toggles handled elsewhere) yield no reports.
+    """
+    builder = ACTION_BUILDERS.get(action)
+    if builder is None:
+        return []
+    reports = []
+    for page in vp.PROFILE_PAGES:
+        reports.extend(builder(params, code_hi_base + page, code_lo, apply_offset, page))
+    return reports
+
 
 class KeyCaptureEdit(QtWidgets.QLineEdit):
     """Key capture widget that distinguishes numpad keys from regular keys.
@@ -147,6 +256,35 @@ class KeyCaptureEdit(QtWidgets.QLineEdit):
             self.keyChanged.emit()
 
 
+class MacroSlotReader(QtCore.QThread):
+    """
+    Reads and parses one macro slot off the GUI thread.
+    The caller owns the device handle; io_lock is held while reading so GUI
+    thread transfers on the same handle wait their turn. Results come back
+    via signals.
+    """
+    loaded = QtCore.pyqtSignal(int, bytes, list)  # slot index, name bytes, MacroEvents
+    failed = QtCore.pyqtSignal(str)
+
+    def __init__(self, device, io_lock, slot_index: int, parent=None):
+        super().__init__(parent)
+        self.device = device
+        self.io_lock = io_lock
+        self.slot_index = slot_index
+
+    def run(self):
+        try:
+            start_page, start_offset = vp.get_macro_slot_info(self.slot_index - 1)
+            # Read just the 384-byte slot (it may straddle two pages)
+            with self.io_lock:
+                raw_macro = self.device.read_flash_range(start_page, start_offset, 384)
+            name_bytes, events = vp.parse_macro_blob(raw_macro)
+        except Exception as exc:
+            self.failed.emit(str(exc))
+            return
+        self.loaded.emit(self.slot_index, name_bytes, events)
+
+
 class MacroRunner(QtCore.QThread):
     """
     Background service that listens for specific trigger keys (F13-F24)
@@ -268,6 +406,11 @@ class MacroRunner(QtCore.QThread):
 
 
 class MainWindow(QtWidgets.QMainWindow):
+    # Shared brushes for the button table (staged / committed / unknown rows)
+    _BRUSH_STAGED = QtGui.QBrush(QtGui.QColor("#FFA500"))
+    _BRUSH_COMMITTED = QtGui.QBrush(QtGui.QColor("white"))
+    _BRUSH_UNKNOWN = QtGui.QBrush(QtGui.QColor("gray"))
+
     def __init__(self) -> None:
         super().__init__()
         self.setWindowTitle("Venus Pro Config v0.2.1 (Reverse Engineering)")
@@ -290,7 +433,28 @@ class MainWindow(QtWidgets.QMainWindow):
         self.holtek_profile: int = 0  # 0-4, selected hardware profile for Holtek device
         self.active_button_profiles: dict = vp.BUTTON_PROFILES
         self.custom_profiles: dict[str, tuple[int, int, int]] = {}
+        self._profile_cache: dict[tuple[str, str], tuple[int, int, int]] = {}  # (key, device_type) -> resolved
         self.button_assignments: dict[str, dict] = {} # Stored button settings from device
+        self._log_buffer: list[str] = []  # _log lines held back while batching
+        self._debug_enabled = DEBUG_LOG  # Per-button parse logging in _read_settings
+        self._char_events: tuple | None = None  # Built on first text macro (_build_char_events)
+        # Shared Venus handle for flash read/write flows (see _acquire_device)
+        self._dev_lock = threading.Lock()
+        # Held for a whole borrowed section so reads and writes on the handle never interleave
+        self._dev_io_lock = threading.RLock()
+        self._dev: vp.VenusDevice | None = None
+        self._dev_path = None  # device_path the shared handle was opened for
+        self._dev_refs = 0
+        # Keep the handle open briefly after the last release so back-to-back
+        # operations (e.g. import then re-read) skip the close/open handshake.
+        self._dev_idle_timer = QtCore.QTimer(self)
+        self._dev_idle_timer.setSingleShot(True)
+        self._dev_idle_timer.setInterval(2000)
+        self._dev_idle_timer.timeout.connect(self._close_idle_device)
+        self._macro_reader: MacroSlotReader | None = None  # In-flight slot load, if any
+        self._pending_macro_slot: int | None = None  # Latest slot requested while a load was running
+        self._rendered_rows: dict[int, tuple] = {}  # btn_table row -> last rendered assignment signature
+        self._log_batched = False
         
         # Load macro names from config EARLY (before UI build)
         self.config_dir = Path.home() / ".config" / "venus_pro_linux"
@@ -321,6 +485,17 @@ class MainWindow(QtWidgets.QMainWindow):
         self.current_edit_key = None
         self._populating_editor = False
         self.button_assignments = {}
+        # Sync order of button_assignments keys, rebuilt only when the key set changes
+        self._sorted_button_keys: tuple[str, ...] = ()
+        self._sorted_button_key_set: frozenset[str] = frozenset()
+        self._button_key_numbers: dict[str, int] = {}
+
+        # Coalesce staged-visual redraws: repeated start() calls within the
+        # interval collapse into one _do_update_staged_visuals() run.
+        self._redraw_timer = QtCore.QTimer(self)
+        self._redraw_timer.setSingleShot(True)
+        self._redraw_timer.setInterval(16)
+        self._redraw_timer.timeout.connect(self._do_update_staged_visuals)
         
         # Staging & Transaction
         self.staging_manager = StagingManager()
@@ -435,6 +610,13 @@ class MainWindow(QtWidgets.QMainWindow):
         self.btn_table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectionBehavior.SelectRows)
         self.btn_table.setSelectionMode(QtWidgets.QAbstractItemView.SelectionMode.SingleSelection)
         self.btn_table.verticalHeader().setVisible(False)
+
+        # Shared fonts for staged (bold) / committed rows, assigned by reference
+        base_font = self.btn_table.font()
+        self._font_bold = QtGui.QFont(base_font)
+        self._font_bold.setBold(True)
+        self._font_normal = QtGui.QFont(base_font)
+        self._font_normal.setBold(False)
         
         # Populate rows
         # Sort by button number (Side 1-12, then others)
@@ -484,6 +666,10 @@ class MainWindow(QtWidgets.QMainWindow):
         for key_name, code in vp.HID_KEY_USAGE.items():
             if code not in self.HID_USAGE_TO_NAME:
                 self.HID_USAGE_TO_NAME[code] = key_name
+        # Dense per-keycode names for macro parsing (keycodes are one byte)
+        self._hid_name_by_code = tuple(
+            self.HID_USAGE_TO_NAME.get(code, f"Key 0x{code:02X}") for code in range(256)
+        )
         
         self.editor_label = QtWidgets.QLabel("Select a button to edit")
 
@@ -527,6 +713,13 @@ class MainWindow(QtWidgets.QMainWindow):
         self.mod_shift = QtWidgets.QCheckBox("Shift")
         self.mod_alt = QtWidgets.QCheckBox("Alt")
         self.mod_win = QtWidgets.QCheckBox("Win")
+        # (checkbox, HID modifier bit) pairs, used to fold checkbox state into a mask
+        self._mod_map = (
+            (self.mod_ctrl, vp.MODIFIER_CTRL),
+            (self.mod_shift, vp.MODIFIER_SHIFT),
+            (self.mod_alt, vp.MODIFIER_ALT),
+            (self.mod_win, vp.MODIFIER_WIN),
+        )
         mod_layout = QtWidgets.QHBoxLayout()
         mod_layout.addWidget(self.mod_ctrl); mod_layout.addWidget(self.mod_shift)
         mod_layout.addWidget(self.mod_alt); mod_layout.addWidget(self.mod_win)
@@ -814,10 +1007,8 @@ class MainWindow(QtWidgets.QMainWindow):
             else:
                 self.key_select.clear()
             
-            self.mod_ctrl.setChecked(bool(mod & vp.MODIFIER_CTRL))
-            self.mod_shift.setChecked(bool(mod & vp.MODIFIER_SHIFT))
-            self.mod_alt.setChecked(bool(mod & vp.MODIFIER_ALT))
-            self.mod_win.setChecked(bool(mod & vp.MODIFIER_WIN))
+            for checkbox, mask in self._mod_map:
+                checkbox.setChecked(bool(mod & mask))
         elif action == "Macro":
             self.macro_index_spin.setValue(params.get("index", 1))
             # Set repeat mode
@@ -1152,8 +1343,7 @@ class MainWindow(QtWidgets.QMainWindow):
                 # Map Qt key to HID key name
                 key_name = self._qt_key_to_name(qt_key, key_text)
                 if key_name and key_name in vp.HID_KEY_USAGE:
-                    import time
-                    current_time = time.time() * 1000  # ms
+                    current_time = time.monotonic() * 1000  # ms, immune to wall-clock jumps
                     delay = int(current_time - self._last_key_time) if self._last_key_time > 0 else 0
                     delay = min(delay, 5000)  # Cap at 5 seconds
                     self._last_key_time = current_time
@@ -1207,7 +1397,29 @@ class MainWindow(QtWidgets.QMainWindow):
         """Add an event row to the macro event table."""
         row = self.macro_event_table.rowCount()
         self.macro_event_table.insertRow(row)
+        self._fill_event_row(row, key_name, is_down, delay, is_modifier)
+        self._update_macro_preview()
+
+    def _set_macro_events(self, events: list) -> None:
+        """Replace the event table with (key_name, is_down, delay, is_modifier) rows.
+
+        Rows are sized once and filled with updates disabled, so the view
+        repaints and the preview recomputes once instead of per event.
+        """
+        table = self.macro_event_table
+        table.setUpdatesEnabled(False)
+        try:
+            table.setRowCount(0)
+            table.setRowCount(len(events))
+            fill = self._fill_event_row
+            for row, (key_name, is_down, delay, is_modifier) in enumerate(events):
+                fill(row, key_name, is_down, delay, is_modifier)
+        finally:
+            table.setUpdatesEnabled(True)
+        self._update_macro_preview()
 
+    def _fill_event_row(self, row: int, key_name: str, is_down: bool, delay: int, is_modifier: bool) -> None:
+        """Populate the cells of an existing event table row."""
         # Row number
         num_item = QtWidgets.QTableWidgetItem(str(row + 1))
         num_item.setFlags(num_item.flags() & ~QtCore.Qt.ItemFlag.ItemIsEditable)
@@ -1239,8 +1451,6 @@ class MainWindow(QtWidgets.QMainWindow):
         delete_btn.clicked.connect(lambda: self._delete_event_row(row))
         self.macro_event_table.setCellWidget(row, 4, delete_btn)
 
-        self._update_macro_preview()
-
     def _delete_event_row(self, row: int) -> None:
         """Delete a row from the event table."""
         # Find the current row of the delete button that was clicked
@@ -1570,13 +1780,39 @@ class MainWindow(QtWidgets.QMainWindow):
         label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
         img_path = Path(__file__).resolve().parent / "mouseimg.png"
         if img_path.exists():
-            pixmap = QtGui.QPixmap(str(img_path))
-            label.setPixmap(pixmap.scaledToWidth(420, QtCore.Qt.TransformationMode.SmoothTransformation))
+            label.setPixmap(self._load_scaled_mouse_pixmap(img_path, 420))
         else:
             label.setText("mouseimg.png not found")
         layout.addWidget(label)
         return group
 
+    def _load_scaled_mouse_pixmap(self, img_path: Path, width: int) -> QtGui.QPixmap:
+        """Load the mouse image pre-scaled to width, reusing a cached copy on disk."""
+        cache_path = None
+        cache_root = QtCore.QStandardPaths.writableLocation(
+            QtCore.QStandardPaths.StandardLocation.GenericCacheLocation)
+        try:
+            src = img_path.stat()
+        except OSError:
+            src = None
+        if cache_root and src is not None:
+            # Source size and mtime are part of the name: a replaced image (even one
+            # installed with an older mtime) never matches a stale cached copy
+            cache_path = (Path(cache_root) / "venus_pro_linux"
+                          / f"{img_path.stem}_{width}_{src.st_size}_{src.st_mtime_ns}.png")
+            cached = QtGui.QPixmap(str(cache_path))
+            if not cached.isNull():
+                return cached
+
+        pixmap = QtGui.QPixmap(str(img_path)).scaledToWidth(width, QtCore.Qt.TransformationMode.SmoothTransformation)
+        if cache_path is not None:
+            try:
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                pixmap.save(str(cache_path), "PNG")
+            except OSError:
+                pass
+        return pixmap
+
 
     def _store_custom_profile(self) -> None:
         button_key = self.current_edit_key
@@ -1595,20 +1831,30 @@ class MainWindow(QtWidgets.QMainWindow):
             self.code_lo_spin.value(),
             self.apply_offset_spin.value(),
         )
+        self._profile_cache.pop((button_key, self.device_type), None)
 
     def _resolve_profile(self, button_key: str, use_fallback: bool) -> tuple[int, int, int]:
+        cache_key = (button_key, self.device_type)
+        cached = self._profile_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         # Holtek uses a different profile structure (index-based)
         if self.device_type == 'holtek':
             profile = self.active_button_profiles.get(button_key)
             if profile is not None:
-                return 0, 0, profile.index
+                resolved = self._profile_cache[cache_key] = (0, 0, profile.index)
+                return resolved
             raise ValueError(f"Unknown Holtek button: {button_key}")
 
         profile = vp.BUTTON_PROFILES[button_key]
         if profile.code_hi is not None and profile.code_lo is not None and profile.apply_offset is not None:
-            return profile.code_hi, profile.code_lo, profile.apply_offset
+            resolved = self._profile_cache[cache_key] = (profile.code_hi, profile.code_lo, profile.apply_offset)
+            return resolved
         if button_key in self.custom_profiles:
-            return self.custom_profiles[button_key]
+            resolved = self._profile_cache[cache_key] = self.custom_profiles[button_key]
+            return resolved
+        # Spin-box fallback reads live editor values, so it is never cached
         if use_fallback and button_key == self.current_edit_key:
             code_hi = self.code_hi_spin.value()
             code_lo = self.code_lo_spin.value()
@@ -1619,8 +1865,24 @@ class MainWindow(QtWidgets.QMainWindow):
 
 
     def _log(self, text: str) -> None:
+        if self._log_batched:
+            self._log_buffer.append(text)
+            return
         self.log_area.appendPlainText(text)
 
+    def _begin_log_batch(self) -> None:
+        """Buffer _log output and freeze log repaints until _end_log_batch."""
+        self._log_batched = True
+        self.log_area.setUpdatesEnabled(False)
+
+    def _end_log_batch(self) -> None:
+        """Flush buffered log lines in one append and re-enable repaints."""
+        self._log_batched = False
+        if self._log_buffer:
+            self.log_area.appendPlainText("\n".join(self._log_buffer))
+            self._log_buffer.clear()
+        self.log_area.setUpdatesEnabled(True)
+
     def _refresh_devices(self) -> None:
         self.device_infos = vp.list_devices()
         self.device_combo.clear()
@@ -1629,9 +1891,9 @@ class MainWindow(QtWidgets.QMainWindow):
         wired_on_bus = False
         wireless_on_bus = False
         if vp.PYUSB_AVAILABLE:
-            import usb.core
-            wired_on_bus = usb.core.find(idVendor=vp.VENDOR_IDS[0], idProduct=vp.PRODUCT_IDS[1]) is not None
-            wireless_on_bus = usb.core.find(idVendor=vp.VENDOR_IDS[0], idProduct=vp.PRODUCT_IDS[0]) is not None
+            on_bus = vp.usb_products_on_bus(vp.VENDOR_IDS[0])
+            wired_on_bus = vp.PRODUCT_IDS[1] in on_bus
+            wireless_on_bus = vp.PRODUCT_IDS[0] in on_bus
 
         # Check if wired mouse is missing from hidapi but present on bus
         wired_found = any(d.product_id == vp.PRODUCT_IDS[1] for d in self.device_infos)
@@ -1680,6 +1942,8 @@ class MainWindow(QtWidgets.QMainWindow):
     def _refresh_and_connect(self) -> None:
         """Refresh devices and store path for transient connections."""
         self._log("Connect: Refreshing device list...")
+        # Explicit connect: don't reuse a cached enumeration
+        vp.invalidate_bus_scan()
         self._refresh_devices()
         if self.device_infos:
             info = self.device_infos[0]
@@ -1691,6 +1955,7 @@ class MainWindow(QtWidgets.QMainWindow):
                 self._log(f"Connect: Device type changed: {self.device_type} -> {new_type}")
             self.device_type = new_type
             self.active_button_profiles = dd.get_button_profiles(self.device_type)
+            self._profile_cache.clear()
             self._rebuild_button_table()
 
             device_name = vp.DEVICE_NAMES.get((info.vendor_id, info.product_id), info.product)
@@ -1706,8 +1971,6 @@ class MainWindow(QtWidgets.QMainWindow):
             # Guard macro tab for Holtek
             self._update_macro_tab_availability()
 
-            QtWidgets.QApplication.processEvents()
-
             # Auto-read settings on startup
             self._log("Connect: Triggering auto-read settings...")
             self._read_settings()
@@ -1726,6 +1989,7 @@ class MainWindow(QtWidgets.QMainWindow):
         self._log(f"Rebuild table: {len(self.sorted_btn_keys)} buttons, keys={self.sorted_btn_keys[:3]}...")
         self.btn_table.clearContents()
         self.btn_table.setRowCount(len(self.sorted_btn_keys))
+        self._rendered_rows.clear()
 
         for i, key in enumerate(self.sorted_btn_keys):
             profile = profiles[key]
@@ -1800,6 +2064,23 @@ class MainWindow(QtWidgets.QMainWindow):
                 device.close()
 
 
+    def _invalidate_key_order(self) -> None:
+        """Drop the cached sync order so the next sync re-sorts the keys."""
+        self._sorted_button_keys = ()
+        self._sorted_button_key_set = frozenset()
+
+    def _get_sorted_keys(self) -> tuple[str, ...]:
+        """Return button_assignments keys ordered by button number (cached)."""
+        keys = self.button_assignments.keys()
+        if not self._sorted_button_keys or keys != self._sorted_button_key_set:
+            numbers = self._button_key_numbers
+            for k in keys:
+                if k not in numbers:
+                    numbers[k] = int(k.split()[1])
+            self._sorted_button_keys = tuple(sorted(keys, key=numbers.__getitem__))
+            self._sorted_button_key_set = frozenset(keys)
+        return self._sorted_button_keys
+
     def _sync_all_buttons(self) -> None:
         """Sync ALL cached button assignments to the device (Reset + Upload)."""
         if not self.device_path: return
@@ -1808,69 +2089,30 @@ class MainWindow(QtWidgets.QMainWindow):
         progress = QtWidgets.QProgressDialog("Syncing... (Resetting Device)", "Cancel", 0, 100, self)
         progress.setWindowModality(QtCore.Qt.WindowModality.WindowModal)
         progress.show()
+        self._begin_log_batch()
+        error = None
         
         try:
-            reports = []
             # 1. Prepare (Cmd 04) - Matches working Windows sequence
-            reports.append(vp.build_simple(0x04))
+            packets = [vp.SIMPLE_04]
             
             # 2. Build Packets
             # Use sorted keys for deterministic packet order
-            keys = sorted(self.button_assignments.keys(), key=lambda k: int(k.split()[1]))
-            
-            for key in keys:
+            for key in self._get_sorted_keys():
                 assign = self.button_assignments[key]
                 action = assign["action"]
                 params = assign["params"]
                 
                 # Resolve addresses
                 code_hi_base, code_lo, apply_offset_base = self._resolve_profile(key, use_fallback=True)
-                profile_pages = [0x00] # Only Page 0 needed for Binds? 
-                # Wait. Key Defs are on Page 1 (0x00+0x00 = 0x00? No, Code Hi is 0x01/0x02).
-                # Current logic used loop [0x00, 0x40, 0x80, 0xC0] to support profiles.
-                # Let's stick to that to be robust.
-                profile_pages = [0x00, 0x40, 0x80, 0xC0]
-                
-                for page in profile_pages:
-                    current_code_hi = code_hi_base + page
-                    
-                    if action == "Keyboard Key":
-                        hid_key = params.get("key", 0)
-                        modifier = params.get("mod", 0)
-                        # Page 1 Write (Key Def)
-                        reports.extend(vp.build_key_binding(current_code_hi, code_lo, hid_key, modifier))
-                        # Page 0 Bind (Type 05)
-                        reports.append(vp.build_keyboard_bind(apply_offset_base, page=page))
-
-                    elif action == "Disabled":
-                        reports.append(vp.build_disabled(apply_offset_base, page=page))
-                        
-                    elif action in ["Left Click", "Right Click", "Middle Click", "Forward", "Back"]:
-                         val_map = {"Left Click": 0x01, "Right Click": 0x02, "Middle Click": 0x04, "Back": 0x08, "Forward": 0x10}
-                         val = val_map.get(action, 0)
-                         reports.append(vp.build_mouse_param(apply_offset_base, val, page=page))
-                    
-                    elif action == "DPI Control":
-                         func_id = params.get("func", 1) # 1=Loop, 2=+, 3=-
-                         dummy_key = 0x23 if func_id==1 else (0x24 if func_id==2 else 0x25)
-                         reports.extend(vp.build_key_binding(current_code_hi, code_lo, dummy_key, 0))
-                         reports.append(vp.build_apply_binding(apply_offset_base, action_type=2, action_code=0x50, modifier=func_id, page=page))
-
-                    elif action in ["Fire Key", "Triple Click"]:
-                         delay = params.get("delay", 40)
-                         rep = params.get("repeat", 3)
-                         reports.append(vp.build_special_binding(apply_offset_base, delay, rep, page=page))
-                    
-                    elif action == "Media Key":
-                         reports.append(vp.build_apply_binding(apply_offset_base, action_type=5, action_code=0x51, page=page))
-                    
-                    elif action == "Macro":
-                         idx = params.get("index", 1)
-                         mode = params.get("mode", vp.MACRO_REPEAT_ONCE)
-                         reports.append(vp.build_macro_bind(apply_offset_base, idx-1, mode, page=page))
+                packets.extend(build_binding_reports(action, params, code_hi_base, code_lo, apply_offset_base))
 
             # 3. Commit
-            reports.append(vp.build_simple(0x04))
+            packets.append(vp.SIMPLE_04)
+
+            # All packets are REPORT_LEN bytes, so stream them from one buffer.
+            # Sent exactly as built: one write per report, so packet i is a logical write
+            reports = b"".join(packets)
             
             # SYNC SEQUENCE
             if self.device_path:
@@ -1879,25 +2121,29 @@ class MainWindow(QtWidgets.QMainWindow):
                 try:
                     # 1. Prepare (Cmd 04)
                     self._log("Readying device for sync...")
-                    if not mouse.send_reliable(vp.build_simple(0x04)):
+                    if not mouse.send_reliable(vp.SIMPLE_04):
                         raise RuntimeError("Sync Timeout: Prepare (0x04)")
 
                     # 2. Handshake (Cmd 03)
-                    if not mouse.send_reliable(vp.build_simple(0x03)):
+                    if not mouse.send_reliable(vp.SIMPLE_03):
                         self._log("Sync failed: Handshake (0x03) timed out.")
                         raise RuntimeError("Sync Timeout: Handshake (0x03)")
                     
                     # 3. Send All Packets
-                    total_pkts = len(reports)
-                    for i, r in enumerate(reports):
+                    view = memoryview(reports)
+                    report_len = vp.REPORT_LEN
+                    total_pkts = len(reports) // report_len
+                    for i in range(total_pkts):
+                        r = view[i * report_len:(i + 1) * report_len]
                         if not mouse.send_reliable(r):
                             raise RuntimeError(f"Sync Timeout: Packet {i} ({r.hex()})")
                         
                         if i % 5 == 0:
                             pct = int((i / total_pkts) * 100)
+                            # Modal QProgressDialog.setValue() already pumps the event loop
                             progress.setValue(pct)
-                            QtWidgets.QApplication.processEvents()
-                            self._log(f"Sync: {r.hex()}")
+                            if DEBUG_PACKET_LOG:
+                                self._log(f"Sync: {r.hex()}")
                     
                     progress.setValue(100)
                     self._log("Sync Complete.")
@@ -1906,9 +2152,14 @@ class MainWindow(QtWidgets.QMainWindow):
             
         except Exception as e:
             self._log(f"Sync Error: {e}")
-            QtWidgets.QMessageBox.critical(self, "Sync Error", str(e))
+            error = str(e)
         finally:
+            self._end_log_batch()
             progress.close()
+        
+        # Reported after the log is flushed so it shows the lines leading up to the error
+        if error is not None:
+            QtWidgets.QMessageBox.critical(self, "Sync Error", error)
 
 
     def _auto_stage_binding(self) -> None:
@@ -1951,10 +2202,9 @@ class MainWindow(QtWidgets.QMainWindow):
             hid_key = vp.HID_KEY_USAGE.get(key_name, 0) or vp.HID_KEY_USAGE.get(key_name.upper(), 0)
             
             modifier = 0
-            if self.mod_ctrl.isChecked(): modifier |= vp.MODIFIER_CTRL
-            if self.mod_shift.isChecked(): modifier |= vp.MODIFIER_SHIFT
-            if self.mod_alt.isChecked(): modifier |= vp.MODIFIER_ALT
-            if self.mod_win.isChecked(): modifier |= vp.MODIFIER_WIN
+            for checkbox, mask in self._mod_map:
+                if checkbox.isChecked():
+                    modifier |= mask
             
             params = {"key": hid_key, "mod": modifier}
 
@@ -1986,7 +2236,7 @@ class MainWindow(QtWidgets.QMainWindow):
             self.staging_manager.stage_change(self.current_edit_key, action, params)
 
         # UPDATE UI
-        self._update_staged_visuals()
+        self._redraw_timer.start()
         
     def _get_binding_description(self, action: str, params: dict) -> str:
         """Get a descriptive string for a button binding."""
@@ -1996,17 +2246,9 @@ class MainWindow(QtWidgets.QMainWindow):
             key_name = self.HID_USAGE_TO_NAME.get(hid_key, f"0x{hid_key:02X}")
             
             # Use Qt names for display if available
-            qt_name_map = {
-                "Enter": "Return", "Escape": "Esc", "Delete": "Del", "Insert": "Ins",
-                "PageUp": "PgUp", "PageDown": "PgDown", "Space": "Space"
-            }
-            display_key = qt_name_map.get(key_name, key_name)
+            display_key = QT_DISPLAY_KEY_NAMES.get(key_name, key_name)
             
-            mods = []
-            if modifier & vp.MODIFIER_CTRL: mods.append("Ctrl")
-            if modifier & vp.MODIFIER_SHIFT: mods.append("Shift")
-            if modifier & vp.MODIFIER_ALT: mods.append("Alt")
-            if modifier & vp.MODIFIER_WIN: mods.append("Win")
+            mods = [name for mask, name in MODIFIER_DISPLAY_NAMES if modifier & mask]
             
             if mods:
                 return f"Key: {display_key} ({'+'.join(mods)})"
@@ -2027,8 +2269,7 @@ class MainWindow(QtWidgets.QMainWindow):
 
         elif action == "DPI Control":
             func = params.get("func", 1)
-            func_map = {1: "Loop", 2: "Up", 3: "Down"}
-            return f"DPI {func_map.get(func, 'Unknown')}"
+            return f"DPI {DPI_FUNC_NAMES.get(func, 'Unknown')}"
             
         elif action == "Disabled":
             return "Disabled"
@@ -2055,7 +2296,7 @@ class MainWindow(QtWidgets.QMainWindow):
         """Handle Ctrl+Z: Undo last staging operation."""
         if self.staging_manager.undo():
             self._log("Undo: Reverted last staged change.")
-            self._update_staged_visuals()
+            self._redraw_timer.start()
             # Update button_assignments from effective state for UI sync
             self.button_assignments = self.staging_manager.get_all_effective_state()
         else:
@@ -2065,46 +2306,57 @@ class MainWindow(QtWidgets.QMainWindow):
         """Handle Ctrl+Shift+Z: Redo last undone operation."""
         if self.staging_manager.redo():
             self._log("Redo: Re-applied staging change.")
-            self._update_staged_visuals()
+            self._redraw_timer.start()
             self.button_assignments = self.staging_manager.get_all_effective_state()
         else:
             self._log("Redo: Nothing to redo.")
 
-    def _update_staged_visuals(self) -> None:
-        """Update button list to show staged vs committed state."""
+    def _do_update_staged_visuals(self) -> None:
+        """Update button list to show staged vs committed state.
+
+        Invoked by ``_redraw_timer`` so bursts of staging events (held Ctrl+Z,
+        auto-staging on every editor change) collapse into a single redraw.
+        """
         staged = self.staging_manager.get_staged_changes()
         has_changes = len(staged) > 0
         
         self.apply_all_button.setEnabled(has_changes)
         self.discard_all_button.setEnabled(has_changes)
         
+        rendered = self._rendered_rows
         for row in range(self.btn_table.rowCount()):
              key = self.btn_table.item(row, 0).data(QtCore.Qt.ItemDataRole.UserRole)
+             if key in staged:
+                 entry = staged[key]
+                 signature = (key, True, entry["action"], tuple(entry["params"].items()))
+             elif key in self.button_assignments:
+                 entry = self.button_assignments[key]
+                 signature = (key, False, entry["action"], tuple(entry["params"].items()))
+             else:
+                 signature = (key, None)
+             # Only touch rows whose assignment changed since they were last drawn
+             if rendered.get(row) == signature:
+                 continue
+             rendered[row] = signature
              item_assign = self.btn_table.item(row, 1)
              
              if key in staged:
-                 entry = staged[key]
                  desc = self._get_binding_description(entry["action"], entry["params"])
                  item_assign.setText(f"{desc} *")
                  # Orange/Yellow for staged
-                 item_assign.setForeground(QtGui.QBrush(QtGui.QColor("#FFA500"))) 
+                 item_assign.setForeground(self._BRUSH_STAGED)
                  # Bold font for emphasis
-                 font = item_assign.font()
-                 font.setBold(True)
-                 item_assign.setFont(font)
+                 item_assign.setFont(self._font_bold)
                  
              elif key in self.button_assignments:
-                 entry = self.button_assignments[key]
                  desc = self._get_binding_description(entry["action"], entry["params"])
                  item_assign.setText(desc)
                  # Standard white/gray for committed
-                 item_assign.setForeground(QtGui.QBrush(QtGui.QColor("white")))
-                 font = item_assign.font()
-                 font.setBold(False)
-                 item_assign.setFont(font)
+                 item_assign.setForeground(self._BRUSH_COMMITTED)
+                 item_assign.setFont(self._font_normal)
              else:
                  item_assign.setText("Unknown")
-                 item_assign.setForeground(QtGui.QBrush(QtGui.QColor("gray")))
+                 item_assign.setForeground(self._BRUSH_UNKNOWN)
 
     def _commit_staged_changes(self) -> None:
         """Commit all staged changes to the device using TransactionController."""
@@ -2175,9 +2427,9 @@ class MainWindow(QtWidgets.QMainWindow):
                 # Actually, StagingManager.base_state should probably replace self.button_assignments
                 # or we sync them.
                 # Let's update self.button_assignments from the now-committed base_state
-                self.button_assignments = deepcopy(self.staging_manager.base_state)
+                self.button_assignments = clone_assignments(self.staging_manager.base_state)
                 
-                self._update_staged_visuals()
+                self._redraw_timer.start()
                 QtWidgets.QMessageBox.information(self, "Success", "All changes applied successfully.")
             else:
                 QtWidgets.QMessageBox.critical(self, "Error", "Failed to apply changes. Device might be disconnected.")
@@ -2188,7 +2440,7 @@ class MainWindow(QtWidgets.QMainWindow):
     def _discard_staged_changes(self) -> None:
         """Discard all staged changes."""
         self.staging_manager.clear_stage()
-        self._update_staged_visuals()
+        self._redraw_timer.start()
 
     def _build_packets_for_key(self, key: str, action: str, params: dict) -> list[bytes]:
         """Helper to build packets for a single key binding."""
@@ -2200,51 +2452,9 @@ class MainWindow(QtWidgets.QMainWindow):
             return hp.build_write_packets(btn_profile.index, action, params,
                                           profile=self.holtek_profile)
 
-        reports = []
         # Resolve addresses
-        # Note: This logic duplicates _sync_all_buttons. Should eventually replace it.
         code_hi_base, code_lo, apply_offset_base = self._resolve_profile(key, use_fallback=True)
-        profile_pages = [0x00, 0x40, 0x80, 0xC0]
-        
-        for page in profile_pages:
-            current_code_hi = code_hi_base + page
-            
-            if action == "Keyboard Key":
-                hid_key = params.get("key", 0)
-                modifier = params.get("mod", 0)
-                # Page 1 Write (Key Def)
-                reports.extend(vp.build_key_binding(current_code_hi, code_lo, hid_key, modifier))
-                # Page 0 Bind (Type 05)
-                reports.append(vp.build_keyboard_bind(apply_offset_base, page=page))
-
-            elif action == "Disabled":
-                reports.append(vp.build_disabled(apply_offset_base, page=page))
-                
-            elif action in ["Left Click", "Right Click", "Middle Click", "Forward", "Back"]:
-                 val_map = {"Left Click": 0x01, "Right Click": 0x02, "Middle Click": 0x04, "Back": 0x08, "Forward": 0x10}
-                 val = val_map.get(action, 0)
-                 reports.append(vp.build_mouse_param(apply_offset_base, val, page=page))
-            
-            elif action == "DPI Control":
-                 func_id = params.get("func", 1) # 1=Loop, 2=+, 3=-
-                 dummy_key = 0x23 if func_id==1 else (0x24 if func_id==2 else 0x25)
-                 reports.extend(vp.build_key_binding(current_code_hi, code_lo, dummy_key, 0))
-                 reports.append(vp.build_apply_binding(apply_offset_base, action_type=2, action_code=0x50, modifier=func_id, page=page))
-
-            elif action in ["Fire Key", "Triple Click"]:
-                 delay = params.get("delay", 40)
-                 rep = params.get("repeat", 3)
-                 reports.append(vp.build_special_binding(apply_offset_base, delay, rep, page=page))
-            
-            elif action == "Media Key":
-                 reports.append(vp.build_apply_binding(apply_offset_base, action_type=5, action_code=0x51, page=page))
-            
-            elif action == "Macro":
-                 idx = params.get("index", 1)
-                 mode = params.get("mode", vp.MACRO_REPEAT_ONCE)
-                 reports.append(vp.build_macro_bind(apply_offset_base, idx-1, mode, page=page))
-                 
-        return reports
+        return build_binding_reports(action, params, code_hi_base, code_lo, apply_offset_base)
 
 
     def _upload_macro(self) -> None:
@@ -2297,13 +2507,13 @@ class MainWindow(QtWidgets.QMainWindow):
             # [0x01-0x1E]: Name in UTF-16LE (30 bytes, padded)
             # [0x1F]: Event count (actual number of events)
             event_count = len(events)
-            header = bytes([name_len]) + name_padded + bytes([event_count])
+            full_macro = bytearray()
+            full_macro.append(name_len)
+            full_macro += name_padded
+            full_macro.append(event_count)
 
             # Event data starts at offset 0x20 (32)
-            event_data = b''.join(ev.to_bytes() for ev in events)
-
-            # Full macro buffer (header + events)
-            full_macro = header + event_data
+            full_macro += vp.MacroEvent.encode_stream(events)
 
             # 3. Calculate terminator checksum
             chk = vp.calculate_terminator_checksum(
@@ -2312,12 +2522,12 @@ class MainWindow(QtWidgets.QMainWindow):
             )
             
             # Terminator is 4 bytes: [checksum] [00] [00] [00]
-            terminator = bytes([chk, 0x00, 0x00, 0x00])
-            full_macro += terminator
+            full_macro.append(chk)
+            full_macro += b'\x00\x00\x00'
 
             # Pad to 10-byte boundary (AFTER adding terminator)
             pad_len = (10 - (len(full_macro) % 10)) % 10
-            full_macro += bytes(pad_len)
+            full_macro.extend(bytes(pad_len))
             
             # Get slot address
             page, offset = vp.get_macro_slot_info(macro_index)
@@ -2326,21 +2536,15 @@ class MainWindow(QtWidgets.QMainWindow):
             
             # Build reports
             reports = [
-                vp.build_simple(0x04),  # Prepare
-                vp.build_simple(0x03)   # Handshake
+                vp.SIMPLE_04,  # Prepare
+                vp.SIMPLE_03   # Handshake
             ]
             
-            # Split into 10-byte chunks
-            addr = (page << 8) | offset
-            for i in range(0, len(full_macro), 10):
-                chunk = full_macro[i:i+10]
-                chunk_addr = addr + i
-                chunk_page = (chunk_addr >> 8) & 0xFF
-                chunk_off = chunk_addr & 0xFF
-                reports.append(vp.build_macro_chunk(chunk_off, chunk, chunk_page))
+            # Split into 10-byte chunks (page advances across boundaries)
+            reports.extend(vp.build_macro_chunks(page, offset, full_macro))
             
             # Commit
-            reports.append(vp.build_simple(0x04))
+            reports.append(vp.SIMPLE_04)
             
             self._send_reports(reports, f"Macro {macro_index+1} Upload ({len(full_macro)} bytes)")
             QtWidgets.QMessageBox.information(self, "Success", f"Macro {macro_index+1} uploaded successfully!")
@@ -2374,8 +2578,7 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def _apply_rgb_preset(self) -> None:
         preset_key = self.rgb_select.currentText()
-        payload = vp.RGB_PRESETS[preset_key]
-        reports = [vp.build_simple(0x03), vp.build_report(0x07, payload), vp.build_simple(0x04)]
+        reports = [vp.SIMPLE_03, vp.RGB_PRESET_REPORTS[preset_key], vp.SIMPLE_04]
         self._send_reports(reports, f"RGB Preset: {preset_key}")
 
     def _apply_rgb_custom(self) -> None:
@@ -2392,7 +2595,7 @@ class MainWindow(QtWidgets.QMainWindow):
 
         rgb_packet = vp.build_rgb(r, g, b, mode, brightness)
         # Sequence based on confirmed captures: 03 (Handshake), [RGB Data], 04 (Commit)
-        reports = [vp.build_simple(0x03), rgb_packet, vp.build_simple(0x04)]
+        reports = [vp.SIMPLE_03, rgb_packet, vp.SIMPLE_04]
 
         mode_name = self.rgb_mode.currentText()
         self._send_reports(reports, f"RGB Custom: #{r:02x}{g:02x}{b:02x} {mode_name} {brightness}%")
@@ -2404,8 +2607,7 @@ class MainWindow(QtWidgets.QMainWindow):
         if self.device_type == 'holtek':
             return self._apply_polling_holtek(rate)
 
-        payload = vp.POLLING_RATE_PAYLOADS[rate]
-        reports = [vp.build_simple(0x04), vp.build_simple(0x03), vp.build_report(0x07, payload)]
+        reports = [vp.SIMPLE_04, vp.SIMPLE_03, vp.POLL_RATE_REPORTS[rate]]
         self._send_reports(reports, f"Polling {rate} Hz")
 
     def _sync_dpi_presets(self) -> None:
@@ -2428,13 +2630,13 @@ class MainWindow(QtWidgets.QMainWindow):
         if self.device_type == 'holtek':
             return self._apply_dpi_holtek()
 
-        reports = [vp.build_simple(0x03)]
+        reports = [vp.SIMPLE_03]
         for slot, (_, _, value_spin, tweak_spin) in enumerate(self.dpi_rows):
             value = value_spin.value()
             tweak = vp.dpi_value_to_tweak(value)
             tweak_spin.setValue(tweak)
             reports.append(vp.build_dpi(slot, value, tweak))
-        # reports.append(vp.build_simple(0x04)) # No trailing 0x04
+        # reports.append(vp.SIMPLE_04) # No trailing 0x04
         self._send_reports(reports, "DPI slots")
 
     def _on_dpi_spin_changed(self, row_index: int) -> None:
@@ -2501,14 +2703,14 @@ class MainWindow(QtWidgets.QMainWindow):
         """
         self._log("  Waiting for device to reconnect...")
         # Initial wait — device needs time to fully disconnect before re-enumerating
-        deadline = time.time() + 2.0
-        while time.time() < deadline:
+        deadline = time.monotonic() + 2.0
+        while time.monotonic() < deadline:
             QtWidgets.QApplication.processEvents()
             time.sleep(0.1)
 
         # Poll for reconnection
-        deadline = time.time() + 8.0
-        while time.time() < deadline:
+        deadline = time.monotonic() + 8.0
+        while time.monotonic() < deadline:
             new_path = hp.find_device_path()
             if new_path:
                 self.device_path = new_path
@@ -2663,12 +2865,18 @@ class MainWindow(QtWidgets.QMainWindow):
         )
 
         if reply == QtWidgets.QMessageBox.StandardButton.Yes:
-            self._send_reports([vp.build_simple(0x09)], "Factory reset")
+            # The reset drops the device's state; don't let the next read reuse the idle handle
+            self._close_idle_device()
+            self._send_reports([vp.SIMPLE_09], "Factory reset")
+            vp.invalidate_bus_scan()
             QtWidgets.QMessageBox.information(self, "Reset Complete", "Factory reset command sent.")
 
     def _reclaim_device(self) -> None:
         """Attempt to reclaim all Venus devices from other processes."""
         self._log("USB: Attempting to reclaim Venus devices from other processes...")
+        # Reattaching the driver invalidates open handles, even on the same path
+        self._close_idle_device()
+        vp.invalidate_bus_scan()
         found = False
         for vid in vp.VENDOR_IDS:
             for pid in vp.PRODUCT_IDS:
@@ -2684,6 +2892,52 @@ class MainWindow(QtWidgets.QMainWindow):
             self._log("USB: No devices found to reclaim.")
             QtWidgets.QMessageBox.information(self, "Device Reclaim", "No Venus Pro devices found on the USB bus.")
 
+    def _acquire_device(self, exclusive: bool = True) -> vp.VenusDevice:
+        """
+        Open (or reuse) the shared Venus handle; pair with _release_device.
+        With exclusive, the calling thread also holds _dev_io_lock until the
+        matching _release_device. Worker threads pass exclusive=False and take
+        _dev_io_lock themselves around their I/O.
+        """
+        self._dev_idle_timer.stop()
+        if exclusive:
+            self._dev_io_lock.acquire()
+        try:
+            with self._dev_lock:
+                if self._dev is not None and self._dev_refs == 0 and self._dev_path != self.device_path:
+                    # Idle handle for a different device: reopen
+                    device, self._dev = self._dev, None
+                    device.close()
+                if self._dev is None:
+                    device = vp.VenusDevice(self.device_path)
+                    device.open()
+                    self._dev = device
+                    self._dev_path = self.device_path
+                self._dev_refs += 1
+                return self._dev
+        except BaseException:
+            if exclusive:
+                self._dev_io_lock.release()
+            raise
+
+    def _release_device(self, exclusive: bool = True) -> None:
+        """Drop one reference to the shared handle; the last one starts the idle close."""
+        if exclusive:
+            self._dev_io_lock.release()
+        with self._dev_lock:
+            self._dev_refs -= 1
+            idle = self._dev_refs == 0 and self._dev is not None
+        if idle:
+            self._dev_idle_timer.start()
+
+    def _close_idle_device(self) -> None:
+        """Close the shared handle if nothing is using it."""
+        self._dev_idle_timer.stop()
+        with self._dev_lock:
+            if self._dev_refs == 0 and self._dev is not None:
+                device, self._dev = self._dev, None
+                device.close()
+
     def _read_settings(self) -> None:
         if not self._require_device(auto_mode=True):
             return
@@ -2694,16 +2948,15 @@ class MainWindow(QtWidgets.QMainWindow):
         self._log("--- Reading from Device ---")
         device = None
         try:
-            # Open device transiently for reading
-            device = vp.VenusDevice(self.device_path)
-            device.open()
+            # Open (or share) the device for reading
+            device = self._acquire_device()
             
             # Retry loop for initial handshake
             max_retries = 3
             for attempt in range(max_retries):
                 try:
                     # Enter read mode with handshake only (Windows sends 0x03 to start reads)
-                    device.send(vp.build_simple(0x03))
+                    device.send(vp.SIMPLE_03)
                     
                     # Try reading Page 0 to verify connection
                     device.read_flash(0, 0, 8)
@@ -2720,23 +2973,13 @@ class MainWindow(QtWidgets.QMainWindow):
                         raise e
             
             # Page 0 contains most settings
-            page0 = bytearray()
-            # Read in larger chunks if reliable, but sticking to 8 bytes for now
-            for offset in range(0, 256, 8):
-                chunk = device.read_flash(0, offset, 8)
-                page0.extend(chunk)
+            page0 = device.read_flash_page(0)
             
             # Page 1 contains keyboard mappings (Part 1)
-            page1 = bytearray()
-            for offset in range(0, 256, 8):
-                chunk = device.read_flash(1, offset, 8)
-                page1.extend(chunk)
+            page1 = device.read_flash_page(1)
 
             # Page 2 contains keyboard mappings (Part 2)
-            page2 = bytearray()
-            for offset in range(0, 256, 8):
-                chunk = device.read_flash(2, offset, 8)
-                page2.extend(chunk)
+            page2 = device.read_flash_page(2)
 
 
             self._log("Flash pages 0 and 1 read complete.")
@@ -2745,12 +2988,7 @@ class MainWindow(QtWidgets.QMainWindow):
             dpi_offsets = [0x0C, 0x10, 0x14, 0x18, 0x1C]
             for i, offset in enumerate(dpi_offsets):
                 val = page0[offset]
-                closest_dpi = 1000
-                min_diff = 999
-                for dpi, info in vp.DPI_PRESETS.items():
-                    if abs(info["value"] - val) < min_diff:
-                        min_diff = abs(info["value"] - val)
-                        closest_dpi = dpi
+                closest_dpi = vp.DPI_VALUE_TO_PRESET[val]
                 
                 if i < len(self.dpi_rows):
                     combo, dpi_spin, value_spin, tweak_spin = self.dpi_rows[i]
@@ -2778,19 +3016,13 @@ class MainWindow(QtWidgets.QMainWindow):
                     combo.blockSignals(False)
 
             # 2. Polling Rate
-            poll_code = page0[0x04]
-            rate = 1000
-            if poll_code == 0x04: rate = 125
-            elif poll_code == 0x02: rate = 250
-            elif poll_code == 0x01: rate = 500
-            elif poll_code == 0x00: rate = 1000
+            rate = POLL_CODE_TO_RATE.get(page0[0x04], 1000)
             
             # Find the rate in the combo box
-            for i in range(self.polling_select.count()):
-                if self.polling_select.itemData(i) == rate:
-                    self.polling_select.setCurrentIndex(i)
-                    self._log(f"  Polling Rate: {rate}Hz")
-                    break
+            idx = self.polling_select.findData(rate)
+            if idx >= 0:
+                self.polling_select.setCurrentIndex(idx)
+                self._log(f"  Polling Rate: {rate}Hz")
 
             # 3. RGB Settings
             rgb_r = page0[0x55]
@@ -2808,14 +3040,9 @@ class MainWindow(QtWidgets.QMainWindow):
             
             # Update mode combo
             # Map 0x56/0x57 back to our labels
-            if rgb_mode == 0x56:
-                idx = self.rgb_mode.findData(vp.RGB_MODE_STEADY)
-                if idx >= 0: self.rgb_mode.setCurrentIndex(idx)
-            elif rgb_mode == 0x57:
-                idx = self.rgb_mode.findData(vp.RGB_MODE_BREATHING) # Or neon
-                if idx >= 0: self.rgb_mode.setCurrentIndex(idx)
-            elif rgb_mode == 0x00: # Off
-                idx = self.rgb_mode.findData(vp.RGB_MODE_OFF)
+            mapped_mode = RGB_FLASH_MODE_MAP.get(rgb_mode)
+            if mapped_mode is not None:
+                idx = self.rgb_mode.findData(mapped_mode)
                 if idx >= 0: self.rgb_mode.setCurrentIndex(idx)
             
             # Brightness
@@ -2826,16 +3053,15 @@ class MainWindow(QtWidgets.QMainWindow):
 
             # 4. Button Bindings
             self._log("  Parsing Button bindings...")
-            for button_key, profile in vp.BUTTON_PROFILES.items():
-                offset = profile.apply_offset
-                btype = page0[offset]
-                d1 = page0[offset + 1]
-                d2 = page0[offset + 2]
+            debug = self._debug_enabled
+            for button_key, offset, p1_offset, is_page1 in vp.BUTTON_RECORDS:
+                btype, d1, d2 = struct.unpack_from("<BBB", page0, offset)
                 
                 action = "Disabled"
                 params = {}
                 
-                self._log(f"DEBUG: Parsing {button_key} (Offset 0x{offset:02X}) -> Type 0x{btype:02X}, D1 0x{d1:02X}, D2 0x{d2:02X}")
+                if debug:
+                    self._log(f"DEBUG: Parsing {button_key} (Offset 0x{offset:02X}) -> Type 0x{btype:02X}, D1 0x{d1:02X}, D2 0x{d2:02X}")
 
                 if btype == vp.BUTTON_TYPE_MOUSE:
                     if d1 == 0x01: action = "Left Click"
@@ -2852,8 +3078,7 @@ class MainWindow(QtWidgets.QMainWindow):
                 
                 # Split logic: Type 0x05 is Standard Keyboard, Type 0x02 is DPI Legacy
                 elif btype == vp.BUTTON_TYPE_KEYBOARD: # 0x05 (Standard/Complex)
-                    p1_offset = profile.code_lo
-                    # ... (rest of keyboard logic follows)
+                    pass  # Handled by the keyboard block below
                     
                 elif btype == vp.BUTTON_TYPE_DPI_LEGACY: # 0x02 (DPI Shortcuts)
                     action = "DPI Control"
@@ -2862,24 +3087,24 @@ class MainWindow(QtWidgets.QMainWindow):
                     
                 # Continue with old logic for compat if needed, but the elif above handles 0x05
                 if btype == vp.BUTTON_TYPE_KEYBOARD: # Re-enter block for keyboard processing
-                    p1_offset = profile.code_lo
                     # Use code_hi to determine which page to read from
-                    kbd_page_src = page1 if profile.code_hi == 0x01 else page2
-                    page_name = "Page 1" if profile.code_hi == 0x01 else "Page 2"
+                    kbd_page_src = page1 if is_page1 else page2
+                    page_name = "Page 1" if is_page1 else "Page 2"
                     
-                    self._log(f"  DEBUG: Checking {page_name} offset 0x{p1_offset:02X}")
+                    if debug:
+                        self._log(f"  DEBUG: Checking {page_name} offset 0x{p1_offset:02X}")
                     
                     kbd_page = kbd_page_src # Alias
                     
                     # Ensure offset is within bounds (256 bytes per page)
                     if p1_offset + 8 <= len(kbd_page):
                         # Dump raw bytes for debugging
-                        raw_bytes = kbd_page[p1_offset : p1_offset + 8]
-                        self._log(f"  DEBUG: Raw Kbd Data: {raw_bytes.hex()}")
+                        if debug:
+                            raw_bytes = kbd_page[p1_offset : p1_offset + 8]
+                            self._log(f"  DEBUG: Raw Kbd Data: {raw_bytes.hex()}")
 
                         # Flash format seems to be: [Type] [Header] [Key] [Mod] ... without the 0x08 length byte
-                        p1_type = kbd_page[p1_offset + 0]
-                        p1_header = kbd_page[p1_offset + 1]
+                        p1_type, p1_header = struct.unpack_from("<BB", kbd_page, p1_offset)
                         
                      
                         if p1_type == 0x02:
@@ -2920,7 +3145,8 @@ class MainWindow(QtWidgets.QMainWindow):
                     action = "Macro"
                     macro_index = d1
                     params["index"] = macro_index + 1
-                    self._log(f"  DEBUG: Macro Index {macro_index+1}")
+                    if debug:
+                        self._log(f"  DEBUG: Macro Index {macro_index+1}")
                     
                     # D2 is repeat mode/count
                     params["mode"] = d2
@@ -2950,13 +3176,14 @@ class MainWindow(QtWidgets.QMainWindow):
                     action = "RGB Toggle"
 
                 self.button_assignments[button_key] = {"action": action, "params": params}
-                self._log(f"  DEBUG: Resolved Action: {action} {params}")
+                if debug:
+                    self._log(f"  DEBUG: Resolved Action: {action} {params}")
 
             self._log("Button bindings parsed.")
             
             # Load base state into staging manager
             self.staging_manager.load_base_state(self.button_assignments)
-            self._update_staged_visuals()
+            self._redraw_timer.start()
             
             # No trailing commit needed after reads - device auto-exits read mode
             # Sending 0x04/0x03 here would RE-ENTER config mode and break button inputs!
@@ -2968,9 +3195,9 @@ class MainWindow(QtWidgets.QMainWindow):
             self._log(f"Error reading configuration: {e}")
             QtWidgets.QMessageBox.critical(self, "Read Error", str(e))
         finally:
-            # Always close the device
+            # Always release the device
             if device:
-                device.close()
+                self._release_device()
 
     def _read_settings_holtek(self, silent: bool = False) -> None:
         """Read settings from Holtek Venus MMO device.
@@ -2992,6 +3219,7 @@ class MainWindow(QtWidgets.QMainWindow):
 
             # Parse button assignments into GUI format
             self.button_assignments = {}
+            self._invalidate_key_order()
             for btn_info in buttons:
                 idx = btn_info['index']
                 btn_key = f"Button {idx + 1}"
@@ -3009,7 +3237,7 @@ class MainWindow(QtWidgets.QMainWindow):
 
             # Load base state into staging manager
             self.staging_manager.load_base_state(self.button_assignments)
-            self._update_staged_visuals()
+            self._redraw_timer.start()
 
             # Update DPI spinboxes from per-profile values
             dpi_stages = config.get('dpi_stages', [])
@@ -3080,22 +3308,19 @@ class MainWindow(QtWidgets.QMainWindow):
         
         device = None
         try:
-            # Open device transiently
-            device = vp.VenusDevice(self.device_path)
-            device.open()
+            # Open (or share) the device
+            device = self._acquire_device()
             
             with open(fname, "wb") as f:
+                page_buf = bytearray(256)  # Reused for every page
                 for page in range(256):
                     if progress.wasCanceled():
                         break
                     progress.setValue(page)
                     
                     # Read page (256 bytes)
-                    page_data = bytearray()
-                    for offset in range(0, 256, 8):
-                        chunk = device.read_flash(page, offset, 8)
-                        page_data.extend(chunk)
-                    f.write(page_data)
+                    device.read_flash_page_into(page, page_buf)
+                    f.write(page_buf)
             self._log(f"Profile exported to {fname}")
             QtWidgets.QMessageBox.information(self, "Export Successful", f"Profile saved to {fname}")
         except Exception as e:
@@ -3103,7 +3328,7 @@ class MainWindow(QtWidgets.QMainWindow):
             QtWidgets.QMessageBox.critical(self, "Export Failed", str(e))
         finally:
             if device:
-                device.close()
+                self._release_device()
             progress.close()
 
     def _import_profile(self) -> None:
@@ -3120,9 +3345,9 @@ class MainWindow(QtWidgets.QMainWindow):
             return
             
         try:
-            data = open(fname, "rb").read()
-            if len(data) != 65536: # 256 * 256
-                QtWidgets.QMessageBox.warning(self, "Invalid File", f"File size must be exactly 64KB (got {len(data)} bytes).")
+            size = os.path.getsize(fname)
+            if size != 65536: # 256 * 256
+                QtWidgets.QMessageBox.warning(self, "Invalid File", f"File size must be exactly 64KB (got {size} bytes).")
                 return
         except Exception as e:
             QtWidgets.QMessageBox.critical(self, "Read Failed", str(e))
@@ -3143,35 +3368,30 @@ class MainWindow(QtWidgets.QMainWindow):
         
         device = None
         try:
-            # Open device transiently
-            device = vp.VenusDevice(self.device_path)
-            device.open()
+            # Open (or share) the device
+            device = self._acquire_device()
             
             # Send initial prepare
-            device.send(vp.build_simple(0x03))
-            device.send(vp.build_simple(0x03))
+            device.send_many((vp.SIMPLE_03, vp.SIMPLE_03))
             
-            import time
-            
-            for page in range(256):
-                if progress.wasCanceled():
-                    break
-                progress.setValue(page)
-                
-                # Extract page data
-                page_start = page * 256
-                page_data = data[page_start : page_start + 256]
-                
-                # Write in 10-byte chunks (protocol limit)
-                for offset in range(0, 256, 10):
-                    chunk = page_data[offset : offset + 10]
-                    packet = vp.build_flash_write(page, offset, chunk)
-                    device.send(packet)
-                    time.sleep(0.002)
+            # Map the file read-only; pages are zero-copy views into the mapping.
+            # Every view must be released before the mapping closes.
+            with open(fname, "rb") as f, \
+                 mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, \
+                 memoryview(mapped) as data_view:
+                for page in range(256):
+                    if progress.wasCanceled():
+                        break
+                    progress.setValue(page)
+                    
+                    # Extract page data
+                    page_start = page * 256
+                    with data_view[page_start : page_start + 256] as page_data:
+                        # Write in 10-byte chunks (protocol limit), built as one buffer per page
+                        device.send_batch(vp.build_flash_page_writes(page, page_data))
                     
             # Finalize
-            device.send(vp.build_simple(0x04))
-            device.send(vp.build_simple(0x04))
+            device.send_many((vp.SIMPLE_04, vp.SIMPLE_04))
             
             self._log(f"Profile imported from {fname}")
             QtWidgets.QMessageBox.information(self, "Import Successful", "Profile successfully written to device.")
@@ -3181,10 +3401,10 @@ class MainWindow(QtWidgets.QMainWindow):
             QtWidgets.QMessageBox.critical(self, "Import Failed", str(e))
         finally:
             if device:
-                device.close()
+                self._release_device()
             progress.close()
         
-        # Reload settings (after device is closed)
+        # Reload settings; the shared handle is still open (idle timer), so this reuses it
         self._read_settings()
 
     def _initialize_default_assignments(self) -> None:
@@ -3194,6 +3414,8 @@ class MainWindow(QtWidgets.QMainWindow):
             
     def _update_all_ui_from_assignments(self) -> None:
         """Refresh the button table and other UI."""
+        # Rows are redrawn directly here; force the next staged redraw to repaint them
+        self._rendered_rows.clear()
         for row in range(self.btn_table.rowCount()):
             key = self.btn_table.item(row, 0).data(QtCore.Qt.ItemDataRole.UserRole)
             if key in self.button_assignments:
@@ -3217,93 +3439,96 @@ class MainWindow(QtWidgets.QMainWindow):
         self._load_macro_from_slot()
 
     def _load_macro_from_slot(self, slot_index: int | None = None) -> None:
-        """Read macro from selected slot and populate table."""
+        """Read macro from selected slot on a worker thread and populate table."""
         if not self._require_device():
             return
             
         if slot_index is None:
             slot_index = self.macro_index_spin.value()
             
+        if self._macro_reader is not None:
+            # Only the most recent request matters; start it when the current read ends
+            self._pending_macro_slot = slot_index
+            return
+            
         start_page, start_offset = vp.get_macro_slot_info(slot_index - 1)
         
         self._log(f"Reading macro slot {slot_index} (Page 0x{start_page:02X}, Offset 0x{start_offset:02X})")
         
-        data = bytearray()
-        device = None
         try:
-            # Open device transiently
-            device = vp.VenusDevice(self.device_path)
-            device.open()
-            
-            # Read two pages of macro data
-            for off in range(0, 256, 8):
-                data.extend(device.read_flash(start_page, off, 8))
-            for off in range(0, 256, 8):
-                data.extend(device.read_flash(start_page + 1, off, 8))
-            
-            # Slice relevant part
-            if start_offset == 0:
-                raw_macro = data[0:384]
-            else:
-                raw_macro = data[128 : 128 + 384]
-                
-            # Parse Name
-            slot_in_data = raw_macro[0]
-            self._log(f"  Slot index in data: {slot_in_data}")
-            
-            # Find name by looking for null terminator in UTF-16LE
-            name_bytes = bytearray()
-            for i in range(1, 29, 2):
-                if i+1 < len(raw_macro):
-                    lo = raw_macro[i]
-                    hi = raw_macro[i+1]
-                    if lo == 0 and hi == 0:
-                        break
-                    name_bytes.extend([lo, hi])
-            
-            if name_bytes:
-                try:
-                    name = name_bytes.decode('utf-16le')
-                    self.macro_name_edit.setText(name)
-                except:
-                    self.macro_name_edit.setText(f"Macro {slot_index}")
-            else:
-                self.macro_name_edit.setText(f"Macro {slot_index}")
-                
-            # Parse Events
-            self.macro_event_table.setRowCount(0)
-            event_offset = 0x20
-            
-            while event_offset < 380:
-                if event_offset + 5 > 384:
-                    break
-                    
-                b0 = raw_macro[event_offset]
-                b1 = raw_macro[event_offset+1]
-                
-                if b0 not in (0x81, 0x41, 0x80, 0x40):
-                    break
-                    
-                keycode = b1
-                delay = (raw_macro[event_offset+3] << 8) | raw_macro[event_offset+4]
-                is_down = (b0 == 0x81 or b0 == 0x80)
-                is_modifier = (b0 == 0x80 or b0 == 0x40)
-                
-                key_name = self.HID_USAGE_TO_NAME.get(keycode, f"Key 0x{keycode:02X}")
-                
-                self._add_event_to_table(key_name, is_down, delay, is_modifier)
-                
-                event_offset += 5
-                
-            self._log(f"Loaded macro slot {slot_index}")
-            
+            # Open (or share) the device; released when the reader finishes
+            device = self._acquire_device(exclusive=False)
         except Exception as e:
             self._log(f"Failed to load macro: {e}")
             QtWidgets.QMessageBox.critical(self, "Load Error", str(e))
-        finally:
-            if device:
-                device.close()
-
+            return
+            
+        reader = MacroSlotReader(device, self._dev_io_lock, slot_index, self)
+        reader.loaded.connect(self._on_macro_slot_loaded)
+        reader.failed.connect(self._on_macro_slot_failed)
+        reader.finished.connect(self._on_macro_reader_finished)
+        self._macro_reader = reader
+        reader.start()
+
+    def _on_macro_slot_loaded(self, slot_index: int, name_bytes: bytes, events: list) -> None:
+        """Populate the macro editor from a parsed slot (GUI thread)."""
+        if slot_index != self.macro_index_spin.value():
+            # The selection moved on while this slot was being read
+            self._log(f"Discarded stale read of macro slot {slot_index}")
+            return
+        # Undecodable units become U+FFFD rather than raising
+        name = name_bytes.decode('utf-16le', errors='replace') or f"Macro {slot_index}"
+        self.macro_name_edit.setText(name)
+            
+        # Fill events in one pass
+        names = self._hid_name_by_code
+        self._set_macro_events([
+            (names[ev.keycode], ev.is_down, ev.delay_ms, ev.is_modifier)
+            for ev in events
+        ])
+        
+        self._log(f"Loaded macro slot {slot_index}")
+
+    def _on_macro_slot_failed(self, message: str) -> None:
+        self._log(f"Failed to load macro: {message}")
+        QtWidgets.QMessageBox.critical(self, "Load Error", message)
+
+    def _on_macro_reader_finished(self) -> None:
+        reader, self._macro_reader = self._macro_reader, None
+        if reader is None:
+            return  # Already handled (closeEvent)
+        self._release_device(exclusive=False)
+        reader.deleteLater()
+        pending, self._pending_macro_slot = self._pending_macro_slot, None
+        if pending is not None:
+            self._load_macro_from_slot(pending)
+
+    def closeEvent(self, event: QtGui.QCloseEvent) -> None:
+        # Don't tear down a reader mid-transfer
+        self._pending_macro_slot = None
+        if self._macro_reader is not None:
+            self._macro_reader.wait()
+            self._on_macro_reader_finished()
+        self._close_idle_device()
+        super().closeEvent(event)
+
+
+    def _build_char_events(self) -> tuple:
+        """Per-ASCII (key_name, mod_name or None) for text macros; None if untypable."""
+        events = []
+        for c in range(128):
+            mapping = vp.ASCII_HID_LUT[c]
+            if mapping is None:
+                events.append(None)
+                continue
+            code, mod = mapping
+            key_name = self._hid_name_by_code[code]
+            if mod == 0:
+                mod_name = None
+            else:
+                mod_name = "Shift" if mod == vp.MODIFIER_SHIFT else f"Mod 0x{mod:02X}"
+            events.append((key_name, mod_name))
+        return tuple(events)
 
     def _generate_text_macro(self) -> None:
         """Generate macro events from quick text with proper modifier handling."""
@@ -3313,34 +3538,39 @@ class MainWindow(QtWidgets.QMainWindow):
             
         delay = self.quick_delay_spin.value()
         
-        self.macro_event_table.setRowCount(0)
-        
         # Estimate size: modifiers add extra events
-        shift_count = sum(1 for c in text if c in vp.ASCII_TO_HID and vp.ASCII_TO_HID[c][1] != 0)
+        # Non-ASCII chars are skipped when generating, so drop them before counting
+        shift_count = sum(text.encode('ascii', errors='ignore').translate(vp.ASCII_MODIFIER_LUT))
         estimated_bytes = 1 + len(text.encode('utf-16le')) + ((len(text) + shift_count * 2) * 5) + 6
         if estimated_bytes > 384:
              QtWidgets.QMessageBox.warning(self, "Too Long", f"Estimated size {estimated_bytes} > 384 bytes.")
              return
         
+        if self._char_events is None:
+            self._char_events = self._build_char_events()
+        char_events = self._char_events
+        # Collect rows first, then fill the table in one pass
+        events = []
+        append = events.append
         for char in text:
-            if char in vp.ASCII_TO_HID:
-                code, mod = vp.ASCII_TO_HID[char]
-                key_name = self.HID_USAGE_TO_NAME.get(code, f"Key 0x{code:02X}")
+            ev = char_events[ord(char)] if ord(char) < 128 else None
+            if ev is not None:
+                key_name, mod_name = ev
                 
-                if mod != 0:
+                if mod_name is not None:
                     # Need modifier (Shift for capitals/symbols)
                     # Pattern: ModDown -> KeyDown -> ModUp -> KeyUp (overlapping)
-                    mod_name = "Shift" if mod == vp.MODIFIER_SHIFT else f"Mod 0x{mod:02X}"
-                    self._add_event_to_table(mod_name, True, delay, is_modifier=True)  # Shift down
-                    self._add_event_to_table(key_name, True, delay)   # Key down
-                    self._add_event_to_table(mod_name, False, delay, is_modifier=True) # Shift up
-                    self._add_event_to_table(key_name, False, delay)  # Key up
+                    append((mod_name, True, delay, True))    # Shift down
+                    append((key_name, True, delay, False))   # Key down
+                    append((mod_name, False, delay, True))   # Shift up
+                    append((key_name, False, delay, False))  # Key up
                 else:
                     # Simple key press/release
-                    self._add_event_to_table(key_name, True, delay)
-                    self._add_event_to_table(key_name, False, delay)
+                    append((key_name, True, delay, False))
+                    append((key_name, False, delay, False))
             else:
                 self._log(f"Skipping unknown char: {char}")
+        self._set_macro_events(events)
 
 
 def main() -> None:
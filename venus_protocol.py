@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+from bisect import bisect_left
 from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Iterable, Optional
 
 import hid
+import struct
 import time
 import sys
 
@@ -36,6 +40,8 @@ def reclaim_device(vendor_id: int, product_id: int) -> bool:
                     dev.attach_kernel_driver(iface)
             except:
                 pass
+        # Re-attached interfaces come back as new hidraw nodes
+        invalidate_bus_scan()
         return True
     except:
         return False
@@ -49,6 +55,7 @@ def reset_usb_device(vendor_id: int, product_id: int) -> bool:
     if dev:
         try:
             dev.reset()
+            invalidate_bus_scan()
             return True
         except:
             return False
@@ -76,6 +83,60 @@ def is_device_busy(vendor_id: int, product_id: int) -> bool:
     except:
         return True # Assume busy if we can't even check
 
+BUS_SCAN_TTL = 2.0  # seconds a PyUSB bus scan stays valid
+_bus_scan_cache: dict[int, tuple[float, frozenset[int]]] = {}
+
+
+def usb_products_on_bus(vendor_id: int, max_age: float = BUS_SCAN_TTL) -> frozenset[int]:
+    """Returns the product IDs of a vendor currently present on the USB bus.
+
+    A single libusb enumeration serves every product of the vendor and the
+    result is reused for ``max_age`` seconds, so repeated presence checks
+    do not each trigger a full bus scan.
+    """
+    if not PYUSB_AVAILABLE:
+        return frozenset()
+
+    now = time.monotonic()
+    cached = _bus_scan_cache.get(vendor_id)
+    if cached is not None and now - cached[0] < max_age:
+        return cached[1]
+
+    try:
+        found = frozenset(dev.idProduct for dev in usb.core.find(find_all=True, idVendor=vendor_id))
+    except Exception:
+        found = frozenset()
+    _bus_scan_cache[vendor_id] = (now, found)
+    return found
+
+
+def invalidate_bus_scan() -> None:
+    """Forces the next usb_products_on_bus() / list_devices() call to rescan."""
+    _bus_scan_cache.clear()
+    _device_list_cache.clear()
+
+
+# Unlock magic packets, already padded to the 17-byte feature report
+_UNLOCK_MAGIC = (
+    # 08 4D 05 50 00 55 00 55 00 55 91
+    bytes([0x08, 0x4D, 0x05, 0x50, 0x00, 0x55, 0x00, 0x55, 0x00, 0x55, 0x91]).ljust(17, b'\x00'),
+    # 08 01 00 00 00 04 56 57 3d 1b 00 00
+    bytes([0x08, 0x01, 0x00, 0x00, 0x00, 0x04, 0x56, 0x57, 0x3d, 0x1b, 0x00, 0x00]).ljust(17, b'\x00'),
+)
+
+
+def _find_venus_usb():
+    """Returns the first Venus device on the bus in (vendor, product) table order.
+
+    One libusb enumeration matches every known ID pair, instead of a
+    separate bus walk per pair.
+    """
+    known = {(vid, pid): rank for rank, (vid, pid) in
+             enumerate((vid, pid) for vid in VENDOR_IDS for pid in PRODUCT_IDS)}
+    matches = usb.core.find(find_all=True, custom_match=lambda d: (d.idVendor, d.idProduct) in known)
+    return min(matches, key=lambda d: known[(d.idVendor, d.idProduct)], default=None)
+
+
 def try_unlock_device() -> bool:
     """Attempts to unlock the device by sending magic packets via pyusb.
     
@@ -86,14 +147,7 @@ def try_unlock_device() -> bool:
         return False
 
     print("Attempting to unlock device...")
-    dev = None
-    for vid in VENDOR_IDS:
-        for pid in PRODUCT_IDS:
-            dev = usb.core.find(idVendor=vid, idProduct=pid)
-            if dev is not None:
-                break
-        if dev is not None:
-            break
+    dev = _find_venus_usb()
     
     if dev is None:
         print("Unlock: No device found.")
@@ -114,24 +168,12 @@ def try_unlock_device() -> bool:
     try:
         usb.util.claim_interface(dev, 1)
         
-        # Helper to send feature report to Interface 1
-        def send_magic(data):
-            padded = data.ljust(17, b'\x00')
-            dev.ctrl_transfer(0x21, 0x09, 0x0308, 1, padded)
-
+        # Feature reports to Interface 1 (SET_REPORT, feature report 0x08)
         # 1. SKIP Reset (Cmd 09) - Causes instability/re-enumeration issues
-        # send_magic(bytes([0x08, 0x09]))
-        # time.sleep(0.5)
-        
-        # 2. Magic packet 1 (CMD 4D)
-        # 08 4D 05 50 00 55 00 55 00 55 91
-        send_magic(bytes([0x08, 0x4D, 0x05, 0x50, 0x00, 0x55, 0x00, 0x55, 0x00, 0x55, 0x91]))
-        time.sleep(0.05)
-        
-        # 3. Magic packet 2 (CMD 01)
-        # 08 01 00 00 00 04 56 57 3d 1b 00 00
-        send_magic(bytes([0x08, 0x01, 0x00, 0x00, 0x00, 0x04, 0x56, 0x57, 0x3d, 0x1b, 0x00, 0x00]))
-        time.sleep(0.05)
+        # 2. Magic packet 1 (CMD 4D), then 3. Magic packet 2 (CMD 01)
+        for packet in _UNLOCK_MAGIC:
+            dev.ctrl_transfer(0x21, 0x09, 0x0308, 1, packet)
+            time.sleep(0.05)
         
         print("Unlock sequence sent.")
         
@@ -145,13 +187,44 @@ def try_unlock_device() -> bool:
                 print(f"Re-attached kernel driver to iface {iface}")
             except:
                 pass
-        # Wait for device to re-enumerate after driver re-attach
-        time.sleep(1.0)
+        # Wait for device to re-enumerate after driver re-attach (nothing to wait for otherwise)
+        if reattach:
+            _wait_for_hidraw(dev.idVendor, dev.idProduct, reattach)
+        # Rescan even if the wait timed out: old paths may be gone
+        invalidate_bus_scan()
     return True
 
 
+REATTACH_TIMEOUT_S = 1.0  # Upper bound on waiting for hidraw nodes after re-attach
+REATTACH_POLL_S = 0.02    # hid.enumerate walks every HID device; don't poll it too hard
+
+
+def _wait_for_hidraw(vendor_id: int, product_id: int, interfaces: list[int]) -> bool:
+    """Waits until hidapi lists a node for every re-attached interface.
+
+    Returns as soon as they appear (typically tens of ms) instead of always
+    sleeping the full REATTACH_TIMEOUT_S; returns False if the timeout hits.
+    """
+    wanted = set(interfaces)
+    deadline = time.monotonic() + REATTACH_TIMEOUT_S
+    while True:
+        try:
+            present = {d['interface_number'] for d in hid.enumerate(vendor_id, product_id)}
+        except Exception:
+            present = set()
+        if wanted <= present:
+            invalidate_bus_scan()
+            return True
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(REATTACH_POLL_S)
+
+
 VENDOR_IDS = (0x25A7, 0x04D9)
 PRODUCT_IDS = (0xFA07, 0xFA08, 0xFC55)
+_PRODUCT_ID_SET = frozenset(PRODUCT_IDS)
+# Config interfaces list_devices() keeps; -1 marks fallback direct-open entries
+_ACCEPTED_INTERFACES = frozenset((-1, 0, 1, 2))
 # Map for friendly names
 DEVICE_NAMES = {
     (0x25A7, 0xFA07): "Venus Pro (Wireless)",
@@ -163,8 +236,11 @@ REPORT_ID = 0x08
 REPORT_LEN = 17
 CHECKSUM_BASE = 0x55
 
+# dataclass(slots=True) needs Python 3.10+; older interpreters keep a __dict__
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class ButtonProfile:
     label: str
     code_hi: int | None
@@ -227,9 +303,23 @@ BUTTON_PROFILES = {
     "Button 16": ButtonProfile("Right Mouse Button", 0x01, 0xC0, 0x78),
 }
 
+# Flattened (key, apply_offset, code_lo, key-def-on-page-1) records for flash decoding
+BUTTON_RECORDS: tuple[tuple[str, int, int, bool], ...] = tuple(
+    (key, p.apply_offset, p.code_lo, p.code_hi == 0x01) for key, p in BUTTON_PROFILES.items()
+)
+# Profiles by 0-based button number ("Button N" -> index N-1)
+BUTTON_PROFILES_INDEXED: tuple[ButtonProfile, ...] = tuple(
+    BUTTON_PROFILES[f"Button {i + 1}"] for i in range(len(BUTTON_PROFILES))
+)
+# Read-only view: profile lookups are cached by callers, so the table must not change
+BUTTON_PROFILES = MappingProxyType(BUTTON_PROFILES)
+# Profile base pages: each binding is written once per hardware profile
+PROFILE_PAGES = (0x00, 0x40, 0x80, 0xC0)
 
 
-RGB_PRESETS = {
+
+# Read-only tables: payloads are shared by identity with the prebuilt reports below
+RGB_PRESETS = MappingProxyType({
     "Neon (Magenta)": bytes(
         [0x00, 0x00, 0x54, 0x08, 0xFF, 0x00, 0xFF, 0x57, 0x02, 0x53, 0x3C, 0x19, 0x00, 0x00]
     ),
@@ -249,10 +339,10 @@ RGB_PRESETS = {
     "Steady (Red, High)": bytes(
         [0x00, 0x00, 0x54, 0x08, 0xFF, 0x00, 0x00, 0x56, 0x01, 0x54, 0xFF, 0x56, 0x00, 0x00]
     ),
-}
+})
 
 # The 27 Quick Pick colors from the Windows utility
-RGB_QUICK_PICKS = [
+RGB_QUICK_PICKS = (
     (0xFF, 0x00, 0x00), (0xE4, 0x00, 0x7F), (0xE8, 0x38, 0x28),
     (0xEA, 0x55, 0x14), (0xF3, 0x98, 0x00), (0xFF, 0xF1, 0x00),
     (0xF8, 0xB6, 0x2D), (0x8F, 0xC3, 0x1F), (0x00, 0xFF, 0x00),
@@ -262,11 +352,11 @@ RGB_QUICK_PICKS = [
     (0xE8, 0xF0, 0xD3), (0xBA, 0xD1, 0x7B), (0x8C, 0xB3, 0x24),
     (0x69, 0x86, 0x1B), (0xBF, 0x75, 0x26), (0xFF, 0x9C, 0x33),
     (0xFF, 0xC4, 0x85), (0xD1, 0x71, 0xAE), (0xB3, 0x12, 0x79)
-]
+)
 
 
 
-POLLING_RATE_PAYLOADS = {
+POLLING_RATE_PAYLOADS = MappingProxyType({
     # Polling rate encoding: code = log2(1000/rate)
     # From wired USB captures:
     # 125Hz = code 0x04 (but pattern suggests 0x03?), 250Hz = 0x02, 500Hz = 0x01, 1000Hz = 0x00
@@ -274,7 +364,7 @@ POLLING_RATE_PAYLOADS = {
     250: bytes([0x00, 0x00, 0x00, 0x02, 0x02, 0x53, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00]),
     500: bytes([0x00, 0x00, 0x00, 0x02, 0x01, 0x54, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00]),
     1000: bytes([0x00, 0x00, 0x00, 0x02, 0x00, 0x55, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00]),
-}
+})
 
 
 DPI_PRESETS = {
@@ -287,52 +377,53 @@ DPI_PRESETS = {
 
 DPI_VALUE_POINTS = sorted((dpi, info["value"]) for dpi, info in DPI_PRESETS.items())
 DPI_VALUE_POINTS_BY_VALUE = sorted((info["value"], dpi) for dpi, info in DPI_PRESETS.items())
+# Raw DPI byte -> nearest preset DPI (first preset wins ties), for decoding flash reads
+DPI_VALUE_TO_PRESET = tuple(
+    min(DPI_PRESETS, key=lambda dpi: abs(DPI_PRESETS[dpi]["value"] - value)) for value in range(256)
+)
 
 
 def dpi_value_to_tweak(value: int) -> int:
     return (0x55 - ((value * 2) & 0xFF)) & 0xFF
 
 
+# Interpolation breakpoints split into x / y columns for bisect
+_DPI_X = tuple(dpi for dpi, _ in DPI_VALUE_POINTS)
+_DPI_Y = tuple(value for _, value in DPI_VALUE_POINTS)
+_VALUE_X = tuple(value for value, _ in DPI_VALUE_POINTS_BY_VALUE)
+_VALUE_Y = tuple(dpi for _, dpi in DPI_VALUE_POINTS_BY_VALUE)
+
+
+def _interpolate(xs: tuple, ys: tuple, x: float) -> float:
+    """Piecewise-linear interpolation, extrapolating from the end segments."""
+    # First segment whose right end is >= x, clamped to the outer segments
+    i = min(max(bisect_left(xs, x), 1), len(xs) - 1)
+    x1, x2 = xs[i - 1], xs[i]
+    y1, y2 = ys[i - 1], ys[i]
+    if x2 == x1:
+        return y1
+    return y1 + (x - x1) * (y2 - y1) / (x2 - x1)
+
+
+@lru_cache(maxsize=256)
 def dpi_to_value(dpi: int) -> int:
     """Convert DPI to the raw byte value using linear interpolation."""
-    points = DPI_VALUE_POINTS
-    if not points:
+    if not _DPI_X:
         return 0
-    if dpi <= points[0][0]:
-        (x1, y1), (x2, y2) = points[0], points[1]
-    elif dpi >= points[-1][0]:
-        (x1, y1), (x2, y2) = points[-2], points[-1]
-    else:
-        for i in range(len(points) - 1):
-            x1, y1 = points[i]
-            x2, y2 = points[i + 1]
-            if x1 <= dpi <= x2:
-                break
-    if x2 == x1:
-        return int(max(0, min(255, round(y1))))
-    value = y1 + (dpi - x1) * (y2 - y1) / (x2 - x1)
-    return int(max(0, min(255, round(value))))
+    return int(max(0, min(255, round(_interpolate(_DPI_X, _DPI_Y, dpi)))))
+
+
+# Raw DPI byte -> interpolated DPI; bytes read from flash always hit this table
+_VALUE_TO_DPI = tuple(int(round(_interpolate(_VALUE_X, _VALUE_Y, v))) for v in range(256)) if _VALUE_X else ()
 
 
 def value_to_dpi(value: int) -> int:
     """Convert raw DPI byte value to an approximate DPI."""
-    points = DPI_VALUE_POINTS_BY_VALUE
-    if not points:
+    if not _VALUE_X:
         return 0
-    if value <= points[0][0]:
-        (x1, y1), (x2, y2) = points[0], points[1]
-    elif value >= points[-1][0]:
-        (x1, y1), (x2, y2) = points[-2], points[-1]
-    else:
-        for i in range(len(points) - 1):
-            x1, y1 = points[i]
-            x2, y2 = points[i + 1]
-            if x1 <= value <= x2:
-                break
-    if x2 == x1:
-        return int(round(y1))
-    dpi = y1 + (value - x1) * (y2 - y1) / (x2 - x1)
-    return int(round(dpi))
+    if type(value) is int and 0 <= value <= 0xFF:
+        return _VALUE_TO_DPI[value]
+    return int(round(_interpolate(_VALUE_X, _VALUE_Y, value)))
 
 
 # Macro Repeat Modes
@@ -448,6 +539,19 @@ ASCII_TO_HID = {
     '\n': (0x28, 0), # Enter
 }
 
+# bytes.translate table: ASCII byte -> 1 if typing it needs a modifier, else 0
+ASCII_MODIFIER_LUT = bytes(
+    1 if ASCII_TO_HID.get(chr(c), (0, 0))[1] else 0 for c in range(256)
+)
+# ASCII code -> (hid_key, modifier) or None, for indexed lookups without hashing
+ASCII_HID_LUT = tuple(ASCII_TO_HID.get(chr(c)) for c in range(128))
+
+
+def encode_text_macro(text: str) -> list[tuple[int, int]]:
+    """Map text to (hid_key, modifier) pairs, dropping untypable characters."""
+    lut = ASCII_HID_LUT
+    return [lut[c] for c in text.encode('ascii', errors='ignore') if lut[c] is not None]
+
 
 
 # Macro Repeat Modes (from Windows USB captures)
@@ -474,22 +578,70 @@ def calc_checksum(prefix: Iterable[int]) -> int:
 
 def build_report(command: int, payload: Iterable[int]) -> bytes:
     """Builds a 17-byte HID report with checksum at byte 16."""
-    r = bytearray(REPORT_LEN)
-    r[0] = REPORT_ID
-    r[1] = command
-    
-    # Payload
-    payload_bytes = bytes(payload)
-    plen = min(len(payload_bytes), 14)
-    r[2:2+plen] = payload_bytes[:plen]
-    
-    # Packet Checksum
-    s_sum = sum(r[0:16]) & 0xFF
-    r[16] = (CHECKSUM_BASE - s_sum) & 0xFF
-    return bytes(r)
+    # Header + payload (truncated / zero-padded to 14 bytes) as one bytes object;
+    # sum() over bytes runs at C level
+    prefix = bytes((REPORT_ID, command)) + bytes(payload)[:14].ljust(14, b'\x00')
+    return prefix + bytes((calc_checksum(prefix),))
+
+
+_ZERO_PAYLOAD = bytes(14)
+# Flash read request payload: [00] [Page] [Offset] [Len] + 10 zero bytes
+_FLASH_READ_PAYLOAD = struct.Struct("4B10x")
+_FLASH_READ_RESPONSE = b"\x09\x08"  # Interrupt-in report ID + flash-read command
+# Flash write header: [00] [Page] [Offset] [Len], followed by up to 10 data bytes
+_FLASH_WRITE_HEADER = struct.Struct("4B")
+
 
+@lru_cache(maxsize=16)
 def build_simple(command: int) -> bytes:
-    return build_report(command, bytes(14))
+    # Reports are immutable bytes, so cached instances can be shared freely
+    return build_report(command, _ZERO_PAYLOAD)
+
+
+SIMPLE_03 = build_simple(0x03)  # Handshake / start
+SIMPLE_04 = build_simple(0x04)  # Prepare / commit
+SIMPLE_09 = build_simple(0x09)  # Reset
+
+# Constant presets as ready-to-send 0x07 reports (payload dicts above kept for callers)
+RGB_PRESET_REPORTS = MappingProxyType(
+    {name: build_report(0x07, payload) for name, payload in RGB_PRESETS.items()})
+POLL_RATE_REPORTS = MappingProxyType(
+    {rate: build_report(0x07, payload) for rate, payload in POLLING_RATE_PAYLOADS.items()})
+
+
+def build_all(specs: Iterable[tuple[int, bytes]]) -> bytearray:
+    """Builds many reports into one contiguous buffer.
+
+    Each spec is a (command, payload) pair laid out exactly as build_report()
+    would; report i occupies buf[i*REPORT_LEN:(i+1)*REPORT_LEN].
+    """
+    specs = list(specs)
+    buf = bytearray(REPORT_LEN * len(specs))
+    off = 0
+    for command, payload in specs:
+        payload = payload[:14]
+        buf[off] = REPORT_ID
+        buf[off + 1] = command
+        buf[off + 2:off + 2 + len(payload)] = payload
+        # Header bytes are known; sum only the payload instead of re-slicing buf
+        buf[off + 16] = (CHECKSUM_BASE - REPORT_ID - command - sum(payload)) & 0xFF
+        off += REPORT_LEN
+    return buf
+
+
+def build_flash_page_writes(page: int, page_data: bytes, chunk_size: int = 10) -> bytearray:
+    """Builds the Cmd 0x07 writes covering page_data as one contiguous buffer.
+
+    Equivalent to build_flash_write(page, off, page_data[off:off+chunk_size])
+    for every chunk offset, concatenated.
+    """
+    specs = []
+    pack_header = _FLASH_WRITE_HEADER.pack
+    page &= 0xFF
+    for offset in range(0, len(page_data), chunk_size):
+        chunk = bytes(page_data[offset:offset + chunk_size])
+        specs.append((0x07, pack_header(0x00, page, offset & 0xFF, len(chunk) & 0xFF) + chunk.ljust(10, b"\x00")))
+    return build_all(specs)
 
 
 def build_flash_write(page: int, offset: int, data: bytes) -> bytes:
@@ -509,11 +661,13 @@ def build_flash_read(page: int, offset: int, length: int) -> bytes:
     The response will arrive on the Interrupt In endpoint (Report ID 0x09).
     Max reliable length per report is 10-11 bytes.
     """
-    payload = bytes([0x00, page & 0xFF, offset & 0xFF, length & 0xFF]) + bytes(10)
+    payload = _FLASH_READ_PAYLOAD.pack(0x00, page & 0xFF, offset & 0xFF, length & 0xFF)
     return build_report(0x08, payload)
 
 
-def build_key_binding(code_hi: int, code_lo: int, hid_key: int, modifier: int = 0x00) -> bytes:
+# Builders below are pure functions of small ints; cached reports are immutable bytes
+@lru_cache(maxsize=4096)
+def build_key_binding(code_hi: int, code_lo: int, hid_key: int, modifier: int = 0x00) -> tuple[bytes, ...]:
     """Build a key binding packet.
     
     Args:
@@ -568,30 +722,10 @@ def build_key_binding(code_hi: int, code_lo: int, hid_key: int, modifier: int =
         
         # Total: 1 + 6 + 1 = 8 bytes (fits in 1 packet)
     
-    # Split payload into chunks of max 10 bytes for the 0x07 write command
-    packets = []
-    chunk_size = 10
-    total_len = len(full_payload)
-    
-    for i in range(0, total_len, chunk_size):
-        chunk = full_payload[i : i + chunk_size]
-        current_len = len(chunk)
-        
-        # Build Write Packet (Cmd 0x07)
-        # Payload: [00] [Page] [Offset+i] [Len] [Data...]
-        # Data chunk must be padded to 10 bytes to satisfy strict 14-byte payload check in build_report
-        padded_chunk = chunk.ljust(10, b'\x00')
-        
-        pkt_payload = bytes([
-            0x00,
-            code_hi,
-            code_lo + i,
-            current_len,
-        ]) + padded_chunk
-        
-        packets.append(build_report(0x07, pkt_payload))
-        
-    return packets
+    # Split payload into 10-byte 0x07 writes at [Page=code_hi] [Offset=code_lo+i];
+    # build_macro_chunks packs each header and zero-pads the data in one step.
+    # Tuple so the cached result can't be mutated by callers
+    return tuple(build_macro_chunks(code_hi, code_lo, full_payload))
 
 def build_key_binding_apply(code_hi: int, code_lo: int, hid_key: int, modifier: int = 0x00) -> bytes:
     """Build the second packet for key binding with modifiers.
@@ -601,6 +735,19 @@ def build_key_binding_apply(code_hi: int, code_lo: int, hid_key: int, modifier:
     return b""
 
 
+# Fixed payload layouts: leading bytes packed in C, zero tail as pad bytes
+_BINDING_PAYLOAD = struct.Struct("8B6x")     # [00] [Page] [Offset] [Len=04] [Type] [D1] [D2] [D3] + 6 zeros
+# Binding D3 = 0x55 - (Type + D1 + D2), folded for D1 = D2 = 0 (or just the type term)
+_D3_KEYBOARD = (0x55 - BUTTON_TYPE_KEYBOARD) & 0xFF     # 0x50
+_D3_POLL_RATE = (0x55 - BUTTON_TYPE_POLL_RATE) & 0xFF   # 0x4E
+_D3_RGB_TOGGLE = (0x55 - BUTTON_TYPE_RGB_TOGGLE) & 0xFF  # 0x4D
+_D3_SPECIAL = 0x55 - BUTTON_TYPE_SPECIAL                 # 0x51, D1/D2 subtracted per call
+_RGB_COLOR_PAYLOAD = struct.Struct("12B2x")  # Steady/Neon colour packet, see build_rgb
+_RGB_OFF_PAYLOAD = RGB_PRESETS["Off"]                    # [00 00 58 02 00 55] + 8 zeros
+_RGB_BREATHING_PAYLOAD = RGB_PRESETS["Breathing (Magenta)"]  # [00 00 5C 02 03 52] + 8 zeros
+
+
+@lru_cache(maxsize=1024)
 def build_rgb(r: int, g: int, b: int, mode: int = RGB_MODE_STEADY, brightness: int = 100) -> bytes:
     """Build an RGB LED control packet.
     
@@ -624,22 +771,17 @@ def build_rgb(r: int, g: int, b: int, mode: int = RGB_MODE_STEADY, brightness: i
     Off (offset 0x58):
     [00, 00, 58, 02, 00, 55, 00, 00, 00, 00, 00, 00, 00, 00]
     """
-    r = max(0, min(255, r))
-    g = max(0, min(255, g))
-    b = max(0, min(255, b))
+    # Inline clamps to 0..255 (no min/max calls)
+    r = 0 if r < 0 else (255 if r > 255 else r)
+    g = 0 if g < 0 else (255 if g > 255 else g)
+    b = 0 if b < 0 else (255 if b > 255 else b)
     
     if mode == RGB_MODE_OFF:
         # Off mode uses special packet at offset 0x58
-        payload = bytes([
-            0x00, 0x00, 0x58, 0x02, 0x00, 0x55,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00
-        ])
+        payload = _RGB_OFF_PAYLOAD
     elif mode == RGB_MODE_BREATHING:
         # Breathing mode uses special packet at offset 0x5C
-        payload = bytes([
-            0x00, 0x00, 0x5C, 0x02, 0x03, 0x52,
-            0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00
-        ])
+        payload = _RGB_BREATHING_PAYLOAD
     else:
         # Steady (0x01) or Neon (0x02) mode at offset 0x54
         # Calculate Color Checksum
@@ -647,13 +789,14 @@ def build_rgb(r: int, g: int, b: int, mode: int = RGB_MODE_STEADY, brightness: i
         color_chk = (0x55 - color_sum) & 0xFF
         
         # Brightness encoding
-        b1 = max(1, min(255, int(brightness * 3)))
+        b1 = int(brightness * 3)
+        b1 = 1 if b1 < 1 else (255 if b1 > 255 else b1)
         b2 = (0x55 - b1) & 0xFF
         
         # For Neon, use mode 0x02; for Steady, use mode 0x01
         hw_mode = 0x02 if mode == RGB_MODE_NEON else 0x01
         
-        payload = bytes([
+        payload = _RGB_COLOR_PAYLOAD.pack(
             0x00,
             0x00,
             0x54,       # RGB offset for Steady/Neon
@@ -666,37 +809,21 @@ def build_rgb(r: int, g: int, b: int, mode: int = RGB_MODE_STEADY, brightness: i
             0x54,       # Constant
             b1,         # Brightness value
             b2,         # Brightness complement
-            0x00,
-            0x00,
-        ])
+        )
     
     return build_report(0x07, payload)
 
 
+@lru_cache(maxsize=1024)
 def build_apply_binding(apply_offset: int, action_type: int, action_code: int, action_index: int = 0x00, modifier: int = 0x00, page: int = 0x00) -> bytes:
     # Packet structure for Page 0 (or Profile N) binding entry:
     # [00] [Page] [Offset] [Len=04] [Type] [D1=Modifier] [D2=action_index] [D3=action_code] ...
-    payload = bytes(
-        [
-            0x00,
-            page,
-            apply_offset,
-            0x04,
-            action_type,
-            modifier,      # D1: Modifier goes here (Shift=0x02, Ctrl=0x01, etc.)
-            action_index,  # D2
-            action_code,   # D3
-            0x00,
-            0x00,
-            0x00,
-            0x00,
-            0x00,
-            0x00,
-        ]
-    )
+    # D1: Modifier (Shift=0x02, Ctrl=0x01, etc.)
+    payload = _BINDING_PAYLOAD.pack(0x00, page, apply_offset, 0x04, action_type, modifier, action_index, action_code)
     return build_report(0x07, payload)
 
 
+@lru_cache(maxsize=256)
 def build_keyboard_bind(apply_offset: int, page: int = 0x00) -> bytes:
     """Build a standard keyboard binding packet (Type 05).
     
@@ -706,25 +833,21 @@ def build_keyboard_bind(apply_offset: int, page: int = 0x00) -> bytes:
     
     Inner Checksum (D3) = 0x55 - (Type + D1 + D2)
     """
-    btype = BUTTON_TYPE_KEYBOARD # 0x05
-    d1 = 0x00
-    d2 = 0x00
-    d3 = (0x55 - (btype + d1 + d2)) & 0xFF # 0x50
-    
-    payload = bytes([
-        0x00,
-        page,
-        apply_offset,
-        0x04,
-        btype,
-        d1,
-        d2,
-        d3,
-        0x00, 0x00, 0x00, 0x00, 0x00, 0x00
-    ])
+    payload = _BINDING_PAYLOAD.pack(0x00, page, apply_offset, 0x04, BUTTON_TYPE_KEYBOARD, 0x00, 0x00, _D3_KEYBOARD)
     return build_report(0x07, payload)
 
 
+# Mouse button val -> binding D3 action code (unknown vals use 0x00)
+_MOUSE_ACTION_CODES = MappingProxyType({
+    0x10: 0x44,  # Forward
+    0x08: 0x4C,  # Back
+    0x01: 0xF0,  # Left (Guess)
+    0x02: 0xF1,  # Right (Guess)
+    0x04: 0xF2,  # Middle (Guess)
+})
+
+
+@lru_cache(maxsize=1024)
 def build_mouse_param(apply_offset: int, val: int, page: int = 0x00) -> bytes:
     """Build a mouse button binding (Left/Right/etc).
     
@@ -765,38 +888,23 @@ def build_mouse_param(apply_offset: int, val: int, page: int = 0x00) -> bytes:
     # But venus_gui calls build_mouse_param(offset, val).
     
     # Let's map val to something reasonable or just 0 if unknown.
-    code = 0x00
-    if val == 0x10: code = 0x44 # Forward
-    elif val == 0x08: code = 0x4C # Back
-    elif val == 0x01: code = 0xF0 # Left (Guess)
-    elif val == 0x02: code = 0xF1 # Right (Guess)
-    elif val == 0x04: code = 0xF2 # Middle (Guess)
-        
+    code = _MOUSE_ACTION_CODES.get(val, 0x00)
     return build_apply_binding(apply_offset, action_type=BUTTON_TYPE_MOUSE, action_code=code, modifier=val, page=page)
 
 
+@lru_cache(maxsize=256)
 def build_forward_back(apply_offset: int, forward: bool, page: int = 0x00) -> bytes:
-    payload = bytes(
-        [
-            0x00,
-            page,
-            apply_offset,
-            0x04,
-            0x01,
-            0x10 if forward else 0x08,
-            0x00,
-            0x44 if forward else 0x4C,
-            0x00,
-            0x00,
-            0x00,
-            0x00,
-            0x00,
-            0x00,
-        ]
+    payload = _BINDING_PAYLOAD.pack(
+        0x00, page, apply_offset, 0x04,
+        0x01,
+        0x10 if forward else 0x08,
+        0x00,
+        0x44 if forward else 0x4C,
     )
     return build_report(0x07, payload)
 
 
+@lru_cache(maxsize=1024)
 def build_special_binding(apply_offset: int, delay_ms: int, repeat_count: int, page: int = 0x00) -> bytes:
     """Build a special button binding (Fire Key, Triple Click, etc.).
     
@@ -810,110 +918,40 @@ def build_special_binding(apply_offset: int, delay_ms: int, repeat_count: int, p
     - Type = 0x04, D1 = delay_ms, D2 = repeat_count
     - D3 = 0x55 - (Type + D1 + D2)
     """
-    btype = BUTTON_TYPE_SPECIAL  # 0x04
     d1 = delay_ms & 0xFF
     d2 = repeat_count & 0xFF
-    d3 = (0x55 - (btype + d1 + d2)) & 0xFF
+    d3 = (_D3_SPECIAL - d1 - d2) & 0xFF
     
-    payload = bytes(
-        [
-            0x00,
-            page,
-            apply_offset,
-            0x04,  # Length
-            btype,
-            d1,
-            d2,
-            d3,
-            0x00,
-            0x00,
-            0x00,
-            0x00,
-            0x00,
-            0x00,
-        ]
-    )
+    payload = _BINDING_PAYLOAD.pack(0x00, page, apply_offset, 0x04, BUTTON_TYPE_SPECIAL, d1, d2, d3)  # 0x04 = Length
     return build_report(0x07, payload)
 
 
+@lru_cache(maxsize=256)
 def build_poll_rate_toggle(apply_offset: int, page: int = 0x00) -> bytes:
     """Build a polling rate toggle binding for a button."""
-    btype = BUTTON_TYPE_POLL_RATE  # 0x07
-    d1, d2 = 0x00, 0x00
-    d3 = (0x55 - (btype + d1 + d2)) & 0xFF  # = 0x4E
-    
-    payload = bytes(
-        [
-            0x00,
-            page,
-            apply_offset,
-            0x04,
-            btype,
-            d1,
-            d2,
-            d3,
-            0x00,
-            0x00,
-            0x00,
-            0x00,
-            0x00,
-            0x00,
-        ]
-    )
+    payload = _BINDING_PAYLOAD.pack(0x00, page, apply_offset, 0x04, BUTTON_TYPE_POLL_RATE, 0x00, 0x00, _D3_POLL_RATE)
     return build_report(0x07, payload)
 
 
+@lru_cache(maxsize=256)
 def build_rgb_toggle(apply_offset: int, page: int = 0x00) -> bytes:
     """Build an RGB LED toggle binding for a button."""
-    btype = BUTTON_TYPE_RGB_TOGGLE  # 0x08
-    d1, d2 = 0x00, 0x00
-    d3 = (0x55 - (btype + d1 + d2)) & 0xFF  # = 0x4D
-    
-    payload = bytes(
-        [
-            0x00,
-            page,
-            apply_offset,
-            0x04,
-            btype,
-            d1,
-            d2,
-            d3,
-            0x00,
-            0x00,
-            0x00,
-            0x00,
-            0x00,
-            0x00,
-        ]
-    )
+    payload = _BINDING_PAYLOAD.pack(0x00, page, apply_offset, 0x04, BUTTON_TYPE_RGB_TOGGLE, 0x00, 0x00, _D3_RGB_TOGGLE)
     return build_report(0x07, payload)
 
 
+@lru_cache(maxsize=256)
 def build_disabled(apply_offset: int, page: int = 0x00) -> bytes:
     """Build a disabled binding for a button."""
-    payload = bytes(
-        [
-            0x00,
-            page,
-            apply_offset,
-            0x04,
-            BUTTON_TYPE_DISABLED,  # 0x00
-            0x00,
-            0x00,
-            0x55,  # Validation byte
-            0x00,
-            0x00,
-            0x00,
-            0x00,
-            0x00,
-            0x00,
-        ]
-    )
+    # 0x55 = validation byte for BUTTON_TYPE_DISABLED (0x00)
+    payload = _BINDING_PAYLOAD.pack(0x00, page, apply_offset, 0x04, BUTTON_TYPE_DISABLED, 0x00, 0x00, 0x55)
     return build_report(0x07, payload)
 
 
-@dataclass(frozen=True)
+# Macro flash event record: [status] [keycode] [pad] [delay, big-endian u16]
+MACRO_EVENT_STRUCT = struct.Struct(">BBBH")
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class MacroEvent:
     keycode: int
     is_down: bool
@@ -928,11 +966,56 @@ class MacroEvent:
         - 0x81 = Key Down, 0x41 = Key Up (regular keys)
         - 0x80 = Modifier Down, 0x40 = Modifier Up (Shift, Ctrl, Alt)
         """
+        return MACRO_EVENT_STRUCT.pack(self.status, self.keycode, 0x00, self.delay_ms & 0xFFFF)
+
+    @property
+    def status(self) -> int:
+        """Status byte for this event (see to_bytes)."""
         if self.is_modifier:
-            status = 0x80 if self.is_down else 0x40
-        else:
-            status = 0x81 if self.is_down else 0x41
-        return bytes([status, self.keycode, 0x00, (self.delay_ms >> 8) & 0xFF, self.delay_ms & 0xFF])
+            return 0x80 if self.is_down else 0x40
+        return 0x81 if self.is_down else 0x41
+
+    def write_into(self, buf: bytearray) -> None:
+        """Append the 5-byte event record (see to_bytes) to buf in place."""
+        buf += MACRO_EVENT_STRUCT.pack(self.status, self.keycode, 0x00, self.delay_ms & 0xFFFF)
+
+    @classmethod
+    def encode_stream(cls, events: list[MacroEvent]) -> bytes:
+        """Encode consecutive event records into one preallocated buffer."""
+        size = MACRO_EVENT_STRUCT.size
+        buf = bytearray(size * len(events))
+        pack_into = MACRO_EVENT_STRUCT.pack_into
+        for i, ev in enumerate(events):
+            pack_into(buf, i * size, ev.status, ev.keycode, 0x00, ev.delay_ms & 0xFFFF)
+        return bytes(buf)
+
+
+_MACRO_STATUS_DOWN = frozenset((0x81, 0x80))
+_MACRO_STATUS_MODIFIER = frozenset((0x80, 0x40))
+_MACRO_STATUSES = _MACRO_STATUS_DOWN | _MACRO_STATUS_MODIFIER | {0x41}
+
+
+def parse_macro_blob(raw: bytes) -> tuple[bytes, list[MacroEvent]]:
+    """Split a 384-byte macro slot into its UTF-16LE name bytes and events.
+
+    Layout: [slot] [name, UTF-16LE, null-terminated, < 0x1D] ... events from 0x20,
+    5 bytes each, up to 70 records; parsing stops at the first unknown status.
+    """
+    # First code-unit-aligned UTF-16LE null in [1, 29)
+    name_end = raw.find(b'\x00\x00', 1, 29)
+    while name_end != -1 and name_end % 2 == 0:
+        name_end = raw.find(b'\x00\x00', name_end + 1, 29)
+    name_bytes = bytes(raw[1:name_end if name_end != -1 else 29])
+
+    events = []
+    append = events.append
+    statuses, downs, modifiers = _MACRO_STATUSES, _MACRO_STATUS_DOWN, _MACRO_STATUS_MODIFIER
+    with memoryview(raw) as view:
+        for status, keycode, _pad, delay in MACRO_EVENT_STRUCT.iter_unpack(view[0x20:0x20 + 5 * 70]):
+            if status not in statuses:
+                break
+            append(MacroEvent(keycode, status in downs, delay, status in modifiers))
+    return name_bytes, events
 
 
 def build_macro_chunk(offset: int, chunk: bytes, macro_page: int = 0x03) -> bytes:
@@ -944,12 +1027,33 @@ def build_macro_chunk(offset: int, chunk: bytes, macro_page: int = 0x03) -> byte
         macro_page: Memory page for macro storage. 
                    From captures: button 1 uses 0x03, button 11 uses 0x18
     """
-    if len(chunk) > 10:
-        raise ValueError("macro chunk must be <= 10 bytes")
     chunk_len = len(chunk)
-    padded = chunk.ljust(10, b"\x00")
-    payload = bytes([0x00, macro_page & 0xFF, offset & 0xFF, chunk_len & 0xFF, *padded])
-    return build_report(0x07, payload)
+    if chunk_len > 10:
+        raise ValueError("macro chunk must be <= 10 bytes")
+    # Header and padded data packed straight into the report, as in build_macro_chunks;
+    # chunk may be any buffer (e.g. memoryview)
+    prefix = bytes((REPORT_ID, 0x07, 0x00, macro_page & 0xFF, offset & 0xFF, chunk_len)) \
+        + bytes(chunk).ljust(10, b"\x00")
+    return prefix + bytes((calc_checksum(prefix),))
+
+
+def build_macro_chunks(page: int, offset: int, data: bytes, chunk_size: int = 10) -> list[bytes]:
+    """Build every macro chunk packet for data written from (page, offset).
+
+    Equivalent to build_macro_chunk() per 10-byte chunk, with each chunk's
+    page/offset advanced across page boundaries; headers are packed directly.
+    """
+    addr = (page << 8) | offset
+    packets = []
+    append = packets.append
+    with memoryview(data) as view:
+        for i in range(0, len(view), chunk_size):
+            chunk = bytes(view[i:i + chunk_size])
+            chunk_addr = addr + i
+            prefix = bytes((REPORT_ID, 0x07, 0x00, (chunk_addr >> 8) & 0xFF, chunk_addr & 0xFF, len(chunk))) \
+                + chunk.ljust(10, b"\x00")
+            append(prefix + bytes((calc_checksum(prefix),)))
+    return packets
 
 
 def build_flash_write(page: int, offset: int, data: bytes) -> bytes:
@@ -961,7 +1065,6 @@ def build_flash_write(page: int, offset: int, data: bytes) -> bytes:
     return build_macro_chunk(offset, data, page)
 
 
-
 def get_macro_page(apply_offset: int) -> int:
     """Calculate the macro memory page for a button.
     
@@ -976,6 +1079,9 @@ def get_macro_page(apply_offset: int) -> int:
     return 0x03 + flash_index
 
 
+_MACRO_TERMINATOR = struct.Struct("B3x")  # [checksum] [00] [00] [00]
+
+
 def build_macro_terminator(offset: int, checksum: int, macro_page: int = 0x03) -> bytes:
     """Build the macro terminator write packet.
 
@@ -987,10 +1093,10 @@ def build_macro_terminator(offset: int, checksum: int, macro_page: int = 0x03) -
         checksum: Calculated checksum using formula: (~sum(data) - count + (index+1)^2) & 0xFF
         macro_page: Memory page for macro storage
     """
-    tail = bytes([checksum, 0x00, 0x00, 0x00])
-    return build_macro_chunk(offset, tail, macro_page)
+    return build_macro_chunk(offset, _MACRO_TERMINATOR.pack(checksum), macro_page)
 
 
+@lru_cache(maxsize=1024)
 def build_macro_bind(apply_offset: int, index: int, repeat: int = 0x01, page: int = 0x00) -> bytes:
     """Build a macro bind packet.
     
@@ -1002,8 +1108,23 @@ def build_macro_bind(apply_offset: int, index: int, repeat: int = 0x01, page: in
     """
     btype = 0x06
     chk = (0x55 - (btype + index + repeat)) & 0xFF
-    data = bytes([btype, index, repeat, chk, 0x00, 0x00, 0x00, 0x00])
-    return build_flash_write(0x00, apply_offset, data)
+    # Flash write of 8 data bytes [Type] [Index] [Repeat] [Chk] + 4 zeros at page 0x00,
+    # packed straight into the 14-byte payload (zero tail included)
+    payload = _BINDING_PAYLOAD.pack(0x00, 0x00, apply_offset & 0xFF, 0x08, btype, index, repeat, chk)
+    return build_report(0x07, payload)
+
+
+MACRO_SLOT_BASE = 0x300    # Macro 0 (Index 0) starts at Page 0x03, Offset 0x00
+MACRO_SLOT_STRIDE = 0x180  # Each slot is 384 bytes, NOT 256
+
+
+def _macro_slot_address(macro_index: int) -> tuple[int, int]:
+    abs_addr = MACRO_SLOT_BASE + (macro_index * MACRO_SLOT_STRIDE)
+    return (abs_addr >> 8) & 0xFF, abs_addr & 0xFF
+
+
+# (page, offset) per slot; covers every slot the GUI exposes with room to spare
+_MACRO_SLOTS = tuple(_macro_slot_address(i) for i in range(32))
 
 
 def get_macro_slot_info(macro_index: int) -> tuple[int, int]:
@@ -1012,42 +1133,22 @@ def get_macro_slot_info(macro_index: int) -> tuple[int, int]:
     Each slot is 384 bytes (0x180).
     Base Address for Macro 0 (Index 0) is Page 0x03, Offset 0x00 (0x300).
     """
-    base_addr = 0x300
-    stride = 0x180
-    
-    abs_addr = base_addr + (macro_index * stride)
-    
-    page = (abs_addr >> 8) & 0xFF
-    offset = abs_addr & 0xFF
-    return page, offset
+    if 0 <= macro_index < len(_MACRO_SLOTS):
+        return _MACRO_SLOTS[macro_index]
+    return _macro_slot_address(macro_index)
 
 
+@lru_cache(maxsize=1024)
 def build_dpi(slot_index: int, value: int, tweak: int) -> bytes:
     if not 0 <= slot_index <= 4:
         raise ValueError("slot_index must be 0..4")
     offset = 0x0C + (slot_index * 4)
-    payload = bytes(
-        [
-            0x00,
-            0x00,
-            offset & 0xFF,
-            0x04,
-            value & 0xFF,
-            value & 0xFF,
-            0x00,
-            tweak & 0xFF,
-            0x00,
-            0x00,
-            0x00,
-            0x00,
-            0x00,
-            0x00,
-        ]
-    )
+    # Same [00] [Page] [Offset] [Len=04] + 4 data bytes layout as a binding entry
+    payload = _BINDING_PAYLOAD.pack(0x00, 0x00, offset & 0xFF, 0x04, value & 0xFF, value & 0xFF, 0x00, tweak & 0xFF)
     return build_report(0x07, payload)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class DeviceInfo:
     path: str
     product: str
@@ -1081,7 +1182,26 @@ def _device_sort_key(info: DeviceInfo) -> tuple[int, int, str]:
     return (1 if is_receiver else 0, interface_rank, info.product)
 
 
-def list_devices(exclude_receivers: bool = False) -> list[DeviceInfo]:
+DEVICE_LIST_TTL = 1.0  # seconds a list_devices() enumeration stays valid
+_device_list_cache: dict[bool, tuple[float, tuple[DeviceInfo, ...]]] = {}
+
+
+def list_devices(exclude_receivers: bool = False, max_age: float = DEVICE_LIST_TTL) -> list[DeviceInfo]:
+    """Returns the attached Venus/Holtek config interfaces, best candidate first.
+
+    hid.enumerate() walks every HID device and slows other USB traffic, so
+    the result is reused for ``max_age`` seconds (pass 0 to force a rescan).
+    """
+    now = time.monotonic()
+    cached = _device_list_cache.get(exclude_receivers)
+    if cached is not None and now - cached[0] < max_age:
+        return list(cached[1])
+    devices = _enumerate_devices(exclude_receivers)
+    _device_list_cache[exclude_receivers] = (now, tuple(devices))
+    return devices
+
+
+def _enumerate_devices(exclude_receivers: bool) -> list[DeviceInfo]:
     devices = []
     found = []
     found_by_enum = set()  # Track (vid, pid) combos found via enumeration
@@ -1091,7 +1211,7 @@ def list_devices(exclude_receivers: bool = False) -> list[DeviceInfo]:
         for vid in VENDOR_IDS:
             devs = hid.enumerate(vid, 0)
             for d in devs:
-                if d['product_id'] in PRODUCT_IDS:
+                if d['product_id'] in _PRODUCT_ID_SET:
                     found.append(d)
                     found_by_enum.add((d['vendor_id'], d['product_id']))
     except:
@@ -1121,7 +1241,7 @@ def list_devices(exclude_receivers: bool = False) -> list[DeviceInfo]:
 
     seen_paths = set()
     for item in found:
-        if item["product_id"] not in PRODUCT_IDS:
+        if item["product_id"] not in _PRODUCT_ID_SET:
             continue
 
         product = item.get("product_string") or "Unknown"
@@ -1133,7 +1253,7 @@ def list_devices(exclude_receivers: bool = False) -> list[DeviceInfo]:
         # Accept interfaces 0, 1, 2 (generic HID config interface on Holtek variants)
         # and -1 for fallback direct-open entries
         interface = item.get("interface_number", -1)
-        if interface not in [-1, 0, 1, 2]:
+        if interface not in _ACCEPTED_INTERFACES:
             continue
         
         path_str = item["path"].decode() if isinstance(item["path"], bytes) else item["path"]
@@ -1186,6 +1306,41 @@ class VenusDevice:
             raise ValueError(f"report must be {REPORT_LEN} bytes")
         self._dev.send_feature_report(report)
 
+    def send_many(self, reports: Iterable[bytes]) -> None:
+        """Sends several reports back-to-back (no pacing, no ACK wait)."""
+        dev = self._dev
+        if dev is None:
+            raise RuntimeError("device not open")
+        send_feature_report = dev.send_feature_report
+        for report in reports:
+            if len(report) != REPORT_LEN:
+                raise ValueError(f"report must be {REPORT_LEN} bytes")
+            send_feature_report(report)
+
+    def send_batch(self, packets: bytes | bytearray | memoryview, interval_s: float = 0.002) -> None:
+        """Sends back-to-back reports from one contiguous buffer.
+
+        The device gets at least ``interval_s`` of idle time after each send
+        returns before the next report goes out; work done between sends
+        counts toward that gap.
+        """
+        dev = self._dev
+        if dev is None:
+            raise RuntimeError("device not open")
+        view = memoryview(packets)
+        if len(view) % REPORT_LEN:
+            raise ValueError(f"report buffer must be a multiple of {REPORT_LEN} bytes")
+        # Bound once: the loop runs per report
+        send_feature_report = dev.send_feature_report
+        monotonic, sleep = time.monotonic, time.sleep
+        next_at = monotonic()
+        for i in range(0, len(view), REPORT_LEN):
+            wait = next_at - monotonic()
+            if wait > 0:
+                sleep(wait)
+            send_feature_report(view[i:i + REPORT_LEN])
+            next_at = monotonic() + interval_s
+
     def send_reliable(self, report: bytes, timeout_ms: int = 500) -> bool:
         """Sends a Feature Report (0x08) and waits for acknowledgment (0x09)."""
         self.send(report)
@@ -1195,9 +1350,16 @@ class VenusDevice:
         page = report[3]
         off = report[4]
         
-        start = time.time()
-        while (time.time() - start) * 1000 < timeout_ms:
-            resp = self._dev.read(64, timeout_ms=50)
+        # Block in hidapi for the whole remaining budget instead of waking every 50 ms
+        # Integer nanosecond deadline, as in read_flash
+        read = self._dev.read
+        monotonic_ns = time.monotonic_ns
+        deadline = monotonic_ns() + timeout_ms * 1_000_000
+        while True:
+            remaining_ms = (deadline - monotonic_ns()) // 1_000_000
+            if remaining_ms <= 0:
+                break
+            resp = read(64, timeout_ms=remaining_ms)
             if resp and resp[0] == 0x09 and resp[1] == cmd:
                 # If it's a memory write, verify page/offset too
                 if cmd == 0x07:
@@ -1213,54 +1375,168 @@ class VenusDevice:
             return False
             
         try:
-            # 1. Reset (Cmd 09)
-            self.send_reliable(build_simple(0x09))
+            # 1. Reset (Cmd 09) - acked on its own so nothing lands mid-reset
+            self.send_reliable(SIMPLE_09)
             
-            # 2. Magic Packet 1 (Cmd 4D)
-            magic1 = bytes([0x08, 0x4D, 0x05, 0x50, 0x00, 0x55, 0x00, 0x55, 0x00, 0x55, 0x91])
-            self.send_reliable(magic1.ljust(17, b'\x00'))
-            
-            # 3. Magic Packet 2 (Cmd 01)
-            magic2 = bytes([0x08, 0x01, 0x00, 0x00, 0x00, 0x04, 0x56, 0x57, 0x3d, 0x1b, 0x00, 0x00])
-            self.send_reliable(magic2.ljust(17, b'\x00'))
+            # 2. Magic Packet 1 (Cmd 4D) and 3. Magic Packet 2 (Cmd 01), prebuilt in
+            # _UNLOCK_MAGIC; the firmware acks each before it accepts the next
+            for magic in _UNLOCK_MAGIC:
+                self.send_reliable(magic)
             
             return True
         except Exception as e:
             print(f"Unlock failed: {e}")
             return False
 
-    def read_flash(self, page: int, offset: int, length: int) -> bytes:
+    def read_flash(self, page: int, offset: int, length: int, flush: bool = True) -> bytes:
         """Read 8 bytes from flash memory at the given page and offset.
         
         Note: Currently fixed to 8 bytes per read to ensure reliability.
+        Pass flush=False when the input queue is known to be drained (e.g.
+        back-to-back reads); stale responses are still skipped by the
+        page/offset match below.
         """
         if self._dev is None:
             raise RuntimeError("device not open")
         
         # Flush any pending reports
-        while True:
-            r = self._dev.read(128, timeout_ms=10)
-            if not r:
-                break
+        if flush:
+            self._flush_input()
         
         req = build_flash_read(page, offset, length)
         self._dev.send_feature_report(req)
         
         # Responses arrive on Interrupt endpoint, Report ID 0x09
-        # Wait up to 100ms for response
-        start_time = time.time()
-        while (time.time() - start_time) < 0.2: # 200ms timeout
-            resp = self._dev.read(128, timeout_ms=50)
-            if resp and resp[0] == 0x09 and resp[1] == 0x08:
-                # Format: 09 08 00 [page] [offset] [len] [data...]
-                # Check consistency
-                if resp[3] == page and resp[4] == offset:
-                    # Successfully read data
-                    data_len = resp[5]
-                    return bytes(resp[6 : 6 + data_len])
+        # Wait up to 200ms, blocking in hidapi for the remaining budget
+        # Format: 09 08 00 [page] [offset] [len] [data...]
+        address = bytes((page & 0xFF, offset & 0xFF))
+        read = self._dev.read
+        deadline = time.monotonic_ns() + 200_000_000
+        while True:
+            remaining_ms = (deadline - time.monotonic_ns()) // 1_000_000
+            if remaining_ms <= 0:
+                break
+            resp = read(128, timeout_ms=remaining_ms)
+            if not resp:
+                continue
+            # One conversion, then compare header/address as byte strings
+            resp = bytes(resp)
+            if resp[:2] == _FLASH_READ_RESPONSE and resp[3:5] == address:
+                # Successfully read data
+                data_len = resp[5]
+                return resp[6 : 6 + data_len]
         
         raise RuntimeError(f"Flash read timeout at Page=0x{page:02X} Offset=0x{offset:02X}")
 
+    def read_flash_pipelined(self, requests: Iterable[tuple[int, int, int]], timeout_ms: int = 500) -> list[bytes]:
+        """Read several (page, offset, length) spans with all requests in flight at once.
+
+        Every read request is sent before any response is awaited; responses
+        are matched back to their request by page/offset, so they may arrive
+        in any order, and each span must start at a distinct address.
+        Returns the data in request order.
+        """
+        if self._dev is None:
+            raise RuntimeError("device not open")
+
+        self._flush_input()
+        requests = list(requests)
+        pending = {}
+        for i, (page, offset, length) in enumerate(requests):
+            self._dev.send_feature_report(build_flash_read(page, offset, length))
+            pending[bytes((page & 0xFF, offset & 0xFF))] = i
+
+        results: list[bytes] = [b""] * len(requests)
+        read = self._dev.read
+        deadline = time.monotonic_ns() + timeout_ms * 1_000_000
+        while pending:
+            remaining_ms = (deadline - time.monotonic_ns()) // 1_000_000
+            if remaining_ms <= 0:
+                page, offset = next(iter(pending))
+                raise RuntimeError(f"Flash read timeout at Page=0x{page:02X} Offset=0x{offset:02X}")
+            resp = read(128, timeout_ms=remaining_ms)
+            if not resp:
+                continue
+            resp = bytes(resp)
+            if resp[:2] == _FLASH_READ_RESPONSE:
+                i = pending.pop(resp[3:5], None)
+                if i is not None:
+                    results[i] = resp[6:6 + resp[5]]
+        return results
+
+    def read_flash_page(self, page: int, chunk_size: int = 8) -> bytes:
+        """Read a full 256-byte flash page.
+
+        The input queue is flushed once for the whole page rather than before
+        each of the 32 chunk reads.
+        """
+        buf = bytearray(256)
+        self.read_flash_page_into(page, buf, chunk_size)
+        return bytes(buf)
+
+    def read_flash_page_into(self, page: int, buf: bytearray, chunk_size: int = 8) -> None:
+        """Read a full 256-byte flash page into a caller-owned buffer.
+
+        Lets bulk readers (profile export) reuse one buffer for every page.
+        Raises RuntimeError on a short or missing chunk rather than leaving
+        the previous page's bytes in the buffer.
+        """
+        if self._dev is None:
+            raise RuntimeError("device not open")
+
+        self._flush_input()
+        view = memoryview(buf)
+        read_flash = self.read_flash
+        for offset in range(0, 256, chunk_size):
+            chunk = read_flash(page, offset, chunk_size, flush=False)[:chunk_size]
+            if len(chunk) != chunk_size:
+                raise RuntimeError(
+                    f"short flash read at page 0x{page:02X} offset 0x{offset:02X}: "
+                    f"{len(chunk)} of {chunk_size} bytes")
+            view[offset:offset + chunk_size] = chunk
+
+    def read_flash_range(self, page: int, offset: int, length: int, chunk_size: int = 8) -> bytes:
+        """Read ``length`` bytes starting at page/offset, continuing across pages.
+
+        Only the requested span is fetched (one flush, ceil(length/8) reads),
+        so e.g. a 384-byte macro slot costs 48 round-trips instead of the 64
+        needed to read both whole pages it straddles.
+        """
+        if self._dev is None:
+            raise RuntimeError("device not open")
+
+        self._flush_input()
+        buf = bytearray(length)
+        view = memoryview(buf)
+        addr = ((page & 0xFF) << 8) | (offset & 0xFF)
+        read_flash = self.read_flash
+        for pos in range(0, length, chunk_size):
+            n = min(chunk_size, length - pos)
+            a = addr + pos
+            chunk = read_flash((a >> 8) & 0xFF, a & 0xFF, n, flush=False)[:n]
+            view[pos:pos + len(chunk)] = chunk
+        return bytes(buf)
+
+    def _flush_input(self) -> None:
+        """Discard any pending input reports.
+
+        The handle is non-blocking (see open), so timeout_ms=0 returns at once
+        when hidapi's queue is empty instead of idling 10 ms per flush.
+        """
+        read = self._dev.read
+        while read(128, timeout_ms=0):
+            pass
+
+
+def finalize_macro_checksum(byte_sum: int, event_count: int, correction: int) -> int:
+    """
+    Fold a raw byte sum into a macro terminator checksum.
+
+    ``~byte_sum`` only depends on the low byte of ``byte_sum``, so the sum
+    does not need masking first; a single final ``& 0xFF`` is enough.
+    """
+    return (~byte_sum - event_count + correction) & 0xFF
+
 
 def calculate_terminator_checksum(
     data: bytes,
@@ -1282,20 +1558,37 @@ def calculate_terminator_checksum(
     else:
         events = data[events_start:events_end]
 
-    s_sum = sum(events) & 0xFF
-    inv_sum = (~s_sum) & 0xFF
-    return (inv_sum - event_count + 0x56) & 0xFF
+    return finalize_macro_checksum(sum(events), event_count, 0x56)
 
 
-def get_macro_slot_info(index: int) -> tuple[int, int]:
-    """Returns (page, offset) for a given macro index (0-based).
-    Stride is 384 bytes (0x180), NOT 256 bytes.
-    Base Address is 0x300 (Page 3, Offset 0).
-    """
-    base_addr = 0x300
-    stride = 0x180
-    abs_addr = base_addr + (index * stride)
-    
-    page = (abs_addr >> 8) & 0xFF
-    offset = abs_addr & 0xFF
-    return page, offset
+# Warm the binding caches for every button on every hardware profile page, so
+# the first click on each button is a cache hit like all later ones.
+# 16 buttons x 4 pages = 64 entries per builder, well inside each maxsize.
+# Keyword `page=` matches how the GUI calls them (lru_cache keys differ otherwise).
+
+
+def _prime_static_bindings() -> None:
+    for profile in BUTTON_PROFILES.values():
+        for page in PROFILE_PAGES:
+            build_disabled(profile.apply_offset, page=page)
+            build_keyboard_bind(profile.apply_offset, page=page)
+            build_poll_rate_toggle(profile.apply_offset, page=page)
+            build_rgb_toggle(profile.apply_offset, page=page)
+
+
+_prime_static_bindings()
+
+
+# Quick-pick swatches in both colour modes at slider stops; 27 x 2 x 5 = 270 packets.
+# Positional arguments match the GUI call.
+_QUICK_PICK_BRIGHTNESS = (20, 40, 60, 80, 100)
+
+
+def _prime_rgb_quick_picks() -> None:
+    for r, g, b in RGB_QUICK_PICKS:
+        for mode in (RGB_MODE_STEADY, RGB_MODE_NEON):
+            for brightness in _QUICK_PICK_BRIGHTNESS:
+                build_rgb(r, g, b, mode, brightness)
+
+
+_prime_rgb_quick_picks()